@@ -1,29 +1,104 @@
+import io
+import os
+import re
+import sys
+import hashlib
+import pickle
+import tempfile
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from collections import defaultdict
-
-# 한국어 폰트 설정
-_ko_font = next(
-    (f.name for f in fm.fontManager.ttflist if 'Nanum' in f.name),
-    None
-)
-if _ko_font:
-    plt.rcParams['font.family'] = _ko_font
-plt.rcParams['axes.unicode_minus'] = False
+from contextlib import contextmanager, redirect_stdout
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import defaultdict, deque, OrderedDict
+
+# 리눅스에서 디스플레이가 없으면 (서버/CI) 창을 띄우지 않고 파일로만 저장
+_HEADLESS = (sys.platform.startswith('linux')
+             and not os.environ.get('DISPLAY')
+             and not os.environ.get('WAYLAND_DISPLAY'))
+
+
+def _import_pyplot():
+    """matplotlib은 시각화할 때만 import (한국어 폰트 설정 포함)"""
+    import matplotlib
+    if _HEADLESS:
+        # GUI 백엔드 초기화 없이 Agg로 바로 렌더링
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm
+
+    _ko_font = next(
+        (f.name for f in fm.fontManager.ttflist if 'Nanum' in f.name),
+        None
+    )
+    if _ko_font:
+        plt.rcParams['font.family'] = _ko_font
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
 
 # Ontology 연동을 위한 추가 import (실제 사용 시)
 try:
-    from rdflib import Graph, Namespace, URIRef, Literal
+    from rdflib import Graph, Namespace, URIRef, Literal, BNode
     from rdflib.namespace import RDF, RDFS, OWL
     RDFLIB_AVAILABLE = True
+    RISK = Namespace("http://shipbuilding.ontology/risk#")
+    # 조회에 쓰는 클래스/프로퍼티 URIRef는 한 번만 생성
+    _C_RISK_FACTOR, _C_COST_DRIVER = RISK.RiskFactor, RISK.CostDriver
+    _P_PROB, _P_CAUSES = RISK.hasProbability, RISK.causes
+    _P_COST, _P_MULT = RISK.hasCostImpact, RISK.hasMultiplier
 except ImportError:
     RDFLIB_AVAILABLE = False
+    RISK = None
     print("Warning: rdflib not installed. Using sample data mode.")
 
+# Turtle 파싱 가속용 (선택 사항, 없으면 rdflib 파서 사용)
+try:
+    import pyoxigraph
+    PYOXIGRAPH_AVAILABLE = True
+except ImportError:
+    PYOXIGRAPH_AVAILABLE = False
+
+# URI fragment (CamelCase) -> snake_case 변환용 정규식 (행마다 호출되므로 미리 컴파일)
+_CAMEL1 = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL2 = re.compile('([a-z0-9])([A-Z])')
+
+# 파싱한 Ontology 파일의 (risk_structure, cost_impacts) 캐시 위치
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "smartshipyard")
+
+_PLOT_DONE_MSG = "\n[시각화 완료] 'shipbuilding_risk_analysis.png' 저장됨"
+
+# 헤드리스 PNG 저장용 단일 워커 (처음 시각화할 때 생성, 인터프리터 종료 시 concurrent.futures가 정리)
+_RENDER_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _render_pool() -> ThreadPoolExecutor:
+    global _RENDER_POOL
+    if _RENDER_POOL is None:
+        _RENDER_POOL = ThreadPoolExecutor(max_workers=1)
+    return _RENDER_POOL
+
+
+def close_figure(fig):
+    """visualize_results의 Future가 돌려준 figure 닫기 (pyplot 전역 상태이므로 메인 스레드에서 호출)"""
+    import matplotlib.pyplot as plt
+    plt.close(fig)
+
+_XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+def _to_rdflib(term):
+    """pyoxigraph 항을 rdflib 항으로 변환"""
+    if isinstance(term, pyoxigraph.NamedNode):
+        return URIRef(term.value)
+    if isinstance(term, pyoxigraph.BlankNode):
+        return BNode(term.value)
+    if term.language:
+        return Literal(term.value, lang=term.language)
+    if term.datatype.value == _XSD_STRING:
+        return Literal(term.value)  # rdflib 파서처럼 plain literal로 유지
+    return Literal(term.value, datatype=URIRef(term.datatype.value))
+
 # =============================================================================
 # Layer 1: Risk Ontology Interface (실제로는 Ontology에서 가져온다고 가정)
 # =============================================================================
@@ -66,10 +141,21 @@ class OntologyConnector:
         self.endpoint_url = endpoint_url
         self.ontology_file = ontology_file
         self.file_format = file_format
+        self._graph = None  # rdflib Graph (rdf 소스일 때 graph 속성 첫 접근 시 파싱)
+        self._cache_path = None
+        self._cached = None  # (risk_structure, cost_impacts)
         
         if ontology_source == 'rdf' and RDFLIB_AVAILABLE:
-            self.graph = self._load_rdf_ontology()
-            self.ns = Namespace("http://shipbuilding.ontology/risk#")
+            self.ns = RISK
+            if ontology_file:
+                # 파일 내용/수정시각이 같으면 파싱 없이 디스크 캐시에서 바로 로드
+                self._cache_path = self._get_cache_path()
+                # 캐시 적중 시 Graph 파싱은 graph 속성을 실제로 쓸 때까지 미룸
+                self._cached = self._read_cache()
+                if self._cached is None:
+                    self._write_cache()
+            else:
+                self._graph = self._load_rdf_ontology()
         elif ontology_source == 'sparql':
             # SPARQL endpoint 연동 준비
             pass
@@ -77,95 +163,187 @@ class OntologyConnector:
             # GraphDB 연동 준비
             pass
     
+    @property
+    def graph(self) -> Optional[Graph]:
+        """rdflib Graph (rdf 소스가 아니면 None, 디스크 캐시 적중 후에는 첫 접근 시 파싱)"""
+        if self._graph is None and self.source == 'rdf' and RDFLIB_AVAILABLE:
+            self._graph = self._load_rdf_ontology()
+        return self._graph
+    
+    @graph.setter
+    def graph(self, graph: Optional[Graph]):
+        self._graph = graph
+    
     def _load_rdf_ontology(self) -> Graph:
         """RDF/OWL 파일에서 Ontology 로드"""
         g = Graph()
         if self.ontology_file:
-            g.parse(self.ontology_file, format='turtle')
+            if PYOXIGRAPH_AVAILABLE:
+                # Rust 파서로 읽은 트리플을 rdflib 항으로 바꿔 일괄 추가 (이후 쿼리 코드는 동일)
+                triples = pyoxigraph.parse(path=self.ontology_file,
+                                           format=pyoxigraph.RdfFormat.TURTLE)
+                g.addN((_to_rdflib(t.subject), _to_rdflib(t.predicate), _to_rdflib(t.object), g)
+                       for t in triples)
+            else:
+                g.parse(self.ontology_file, format='turtle')
             print(f"[Ontology] Loaded {len(g)} triples from {self.ontology_file}")
         else:
             # 샘플 Ontology 생성
             g = self._create_sample_rdf_ontology()
         return g
     
+    def _get_cache_path(self) -> str:
+        """파일 내용 + 수정시각 + 추출 코드(이 모듈) 수정시각 해시로 캐시 파일 경로 결정"""
+        h = hashlib.blake2b(digest_size=16)
+        with open(self.ontology_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                h.update(chunk)
+        h.update(str(os.path.getmtime(self.ontology_file)).encode())
+        # 추출기(_query_rdf_*)가 바뀌면 이전 pickle을 쓰지 않도록 모듈 수정시각도 포함
+        h.update(str(os.path.getmtime(__file__)).encode())
+        return os.path.join(_CACHE_DIR, f"ont_{h.hexdigest()}.pkl")
+    
+    def _read_cache(self):
+        """캐시된 (risk_structure, cost_impacts) 로드 (없거나 깨졌으면 None)"""
+        try:
+            with open(self._cache_path, 'rb') as f:
+                risk_rows, cost_rows = pickle.load(f)
+            cached = ({fid: RiskFactor(name, prob, list(parents))
+                       for fid, (name, prob, parents) in risk_rows.items()},
+                      {cid: CostImpact(factor, base, mult)
+                       for cid, (factor, base, mult) in cost_rows.items()})
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[Ontology] Ignoring unreadable cache {self._cache_path}: {e}")
+            return None
+        print(f"[Ontology] Loaded cached structure for {self.ontology_file}")
+        return cached
+    
+    def _extract_rdf(self) -> Tuple[Dict[str, RiskFactor], Dict[str, CostImpact]]:
+        """Graph에서 리스크 구조와 원가 영향을 한 번만 추출 (이후 쿼리는 메모리 캐시 사용)"""
+        if self._cached is None:
+            self._cached = (self._query_rdf_structure(), self._query_rdf_cost_impacts())
+        return self._cached
+    
+    def _write_cache(self):
+        """추출한 구조를 캐시 파일로 저장"""
+        self._extract_rdf()
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+        except OSError as e:
+            print(f"[Ontology] Could not write cache {self._cache_path}: {e}")
+            return
+        # 클래스 객체 대신 기본 타입 튜플로 저장 (__main__으로 실행/import 어느 쪽에서도 읽히도록)
+        risk_structure, cost_impacts = self._cached
+        rows = ({fid: (r.name, r.probability, tuple(r.parents)) for fid, r in risk_structure.items()},
+                {cid: (c.factor, c.base_cost, c.multiplier_if_triggered)
+                 for cid, c in cost_impacts.items()})
+        # 임시 파일에 먼저 기록한 뒤 교체 (실패/중단 시 잘린 캐시 파일이 남지 않도록)
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._cache_path)
+        except Exception as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            print(f"[Ontology] Could not write cache {self._cache_path}: {e}")
+    
+    def invalidate_cache(self):
+        """디스크 캐시 삭제 후 다음 쿼리부터 Ontology 파일을 다시 파싱"""
+        if self._cache_path and os.path.exists(self._cache_path):
+            os.remove(self._cache_path)
+        self._cached = None
+        # 파일이 바뀌었을 수 있으므로 Graph도 다음 접근 시 다시 파싱
+        self._graph = None
+    
     def _create_sample_rdf_ontology(self) -> Graph:
         """샘플 RDF Ontology 생성 (실제로는 별도 파일)"""
         g = Graph()
-        ns = Namespace("http://shipbuilding.ontology/risk#")
+        ns = RISK
         g.bind("risk", ns)
         
-        # 클래스 정의
-        g.add((ns.RiskFactor, RDF.type, OWL.Class))
-        g.add((ns.CostDriver, RDF.type, OWL.Class))
-        g.add((ns.Process, RDF.type, OWL.Class))
-        
-        # 프로퍼티 정의
-        g.add((ns.causes, RDF.type, OWL.ObjectProperty))
-        g.add((ns.impacts, RDF.type, OWL.ObjectProperty))
-        g.add((ns.hasProbability, RDF.type, OWL.DatatypeProperty))
-        g.add((ns.hasCostImpact, RDF.type, OWL.DatatypeProperty))
-        
-        # 인스턴스 - Root Risk Factors
         material_delay = ns.MaterialDelay
-        g.add((material_delay, RDF.type, ns.RiskFactor))
-        g.add((material_delay, RDFS.label, Literal("강재납기지연")))
-        g.add((material_delay, ns.hasProbability, Literal(0.30)))
-        
         design_change = ns.DesignChange
-        g.add((design_change, RDF.type, ns.RiskFactor))
-        g.add((design_change, RDFS.label, Literal("설계변경")))
-        g.add((design_change, ns.hasProbability, Literal(0.15)))
-        
         manpower_shortage = ns.ManpowerShortage
-        g.add((manpower_shortage, RDF.type, ns.RiskFactor))
-        g.add((manpower_shortage, RDFS.label, Literal("인력부족")))
-        g.add((manpower_shortage, ns.hasProbability, Literal(0.25)))
-        
         bad_weather = ns.BadWeather
-        g.add((bad_weather, RDF.type, ns.RiskFactor))
-        g.add((bad_weather, RDFS.label, Literal("악천후")))
-        g.add((bad_weather, ns.hasProbability, Literal(0.20)))
-        
-        # 인스턴스 - Intermediate Factors
         block_delay = ns.BlockDelay
-        g.add((block_delay, RDF.type, ns.RiskFactor))
-        g.add((block_delay, RDFS.label, Literal("블록작업지연")))
-        g.add((material_delay, ns.causes, block_delay))
-        g.add((manpower_shortage, ns.causes, block_delay))
-        
         rework = ns.Rework
-        g.add((rework, RDF.type, ns.RiskFactor))
-        g.add((rework, RDFS.label, Literal("재작업")))
-        g.add((design_change, ns.causes, rework))
-        g.add((bad_weather, ns.causes, rework))
-        
         idle_time = ns.IdleTime
-        g.add((idle_time, RDF.type, ns.RiskFactor))
-        g.add((idle_time, RDFS.label, Literal("대기시간")))
-        g.add((material_delay, ns.causes, idle_time))
-        g.add((block_delay, ns.causes, idle_time))
-        
-        # 인스턴스 - Cost Drivers
         overtime = ns.Overtime
-        g.add((overtime, RDF.type, ns.CostDriver))
-        g.add((overtime, RDFS.label, Literal("특근투입")))
-        g.add((block_delay, ns.causes, overtime))
-        g.add((idle_time, ns.causes, overtime))
-        g.add((overtime, ns.hasCostImpact, Literal(3.0)))  # 기본 비용
-        
         material_waste = ns.MaterialWaste
-        g.add((material_waste, RDF.type, ns.CostDriver))
-        g.add((material_waste, RDFS.label, Literal("자재손실")))
-        g.add((rework, ns.causes, material_waste))
-        g.add((design_change, ns.causes, material_waste))
-        g.add((material_waste, ns.hasCostImpact, Literal(1.0)))
-        
         equipment_extend = ns.EquipmentExtend
-        g.add((equipment_extend, RDF.type, ns.CostDriver))
-        g.add((equipment_extend, RDFS.label, Literal("장비임대연장")))
-        g.add((block_delay, ns.causes, equipment_extend))
-        g.add((bad_weather, ns.causes, equipment_extend))
-        g.add((equipment_extend, ns.hasCostImpact, Literal(2.0)))
+        
+        triples = [
+            # 클래스 정의
+            (ns.RiskFactor, RDF.type, OWL.Class),
+            (ns.CostDriver, RDF.type, OWL.Class),
+            (ns.Process, RDF.type, OWL.Class),
+            
+            # 프로퍼티 정의
+            (ns.causes, RDF.type, OWL.ObjectProperty),
+            (ns.impacts, RDF.type, OWL.ObjectProperty),
+            (ns.hasProbability, RDF.type, OWL.DatatypeProperty),
+            (ns.hasCostImpact, RDF.type, OWL.DatatypeProperty),
+            
+            # 인스턴스 - Root Risk Factors
+            (material_delay, RDF.type, ns.RiskFactor),
+            (material_delay, RDFS.label, Literal("강재납기지연")),
+            (material_delay, ns.hasProbability, Literal(0.30)),
+            
+            (design_change, RDF.type, ns.RiskFactor),
+            (design_change, RDFS.label, Literal("설계변경")),
+            (design_change, ns.hasProbability, Literal(0.15)),
+            
+            (manpower_shortage, RDF.type, ns.RiskFactor),
+            (manpower_shortage, RDFS.label, Literal("인력부족")),
+            (manpower_shortage, ns.hasProbability, Literal(0.25)),
+            
+            (bad_weather, RDF.type, ns.RiskFactor),
+            (bad_weather, RDFS.label, Literal("악천후")),
+            (bad_weather, ns.hasProbability, Literal(0.20)),
+            
+            # 인스턴스 - Intermediate Factors
+            (block_delay, RDF.type, ns.RiskFactor),
+            (block_delay, RDFS.label, Literal("블록작업지연")),
+            (material_delay, ns.causes, block_delay),
+            (manpower_shortage, ns.causes, block_delay),
+            
+            (rework, RDF.type, ns.RiskFactor),
+            (rework, RDFS.label, Literal("재작업")),
+            (design_change, ns.causes, rework),
+            (bad_weather, ns.causes, rework),
+            
+            (idle_time, RDF.type, ns.RiskFactor),
+            (idle_time, RDFS.label, Literal("대기시간")),
+            (material_delay, ns.causes, idle_time),
+            (block_delay, ns.causes, idle_time),
+            
+            # 인스턴스 - Cost Drivers
+            (overtime, RDF.type, ns.CostDriver),
+            (overtime, RDFS.label, Literal("특근투입")),
+            (block_delay, ns.causes, overtime),
+            (idle_time, ns.causes, overtime),
+            (overtime, ns.hasCostImpact, Literal(3.0)),  # 기본 비용
+            
+            (material_waste, RDF.type, ns.CostDriver),
+            (material_waste, RDFS.label, Literal("자재손실")),
+            (rework, ns.causes, material_waste),
+            (design_change, ns.causes, material_waste),
+            (material_waste, ns.hasCostImpact, Literal(1.0)),
+            
+            (equipment_extend, RDF.type, ns.CostDriver),
+            (equipment_extend, RDFS.label, Literal("장비임대연장")),
+            (block_delay, ns.causes, equipment_extend),
+            (bad_weather, ns.causes, equipment_extend),
+            (equipment_extend, ns.hasCostImpact, Literal(2.0)),
+        ]
+        
+        # 트리플을 하나씩 add 하지 않고 한 번에 일괄 추가
+        g.addN((subj, pred, obj, g) for subj, pred, obj in triples)
         
         print(f"[Ontology] Created sample ontology with {len(g)} triples")
         return g
@@ -177,7 +355,7 @@ class OntologyConnector:
             return self._get_sample_structure()
         
         elif self.source == 'rdf' and RDFLIB_AVAILABLE:
-            return self._query_rdf_structure()
+            return self._extract_rdf()[0]
         
         elif self.source == 'sparql':
             return self._query_sparql_structure()
@@ -190,51 +368,30 @@ class OntologyConnector:
             return self._get_sample_structure()
     
     def _query_rdf_structure(self) -> Dict[str, RiskFactor]:
-        """RDF Graph에서 SPARQL로 리스크 구조 추출"""
+        """RDF Graph에서 트리플 인덱스 스캔으로 리스크 구조 추출"""
         risk_structure = {}
+        ids = {}  # URIRef -> factor_id (causes 순회 시 문자열 변환 재사용)
+        g = self.graph
+        
+        # 모든 RiskFactor와 CostDriver (SPARQL 파싱 없이 POS 인덱스 직접 조회)
+        for factor_class in (_C_RISK_FACTOR, _C_COST_DRIVER):
+            for factor in g.subjects(RDF.type, factor_class):
+                label = g.value(factor, RDFS.label)
+                if label is None:
+                    continue
+                probability = g.value(factor, _P_PROB)
+                
+                factor_id = ids[factor] = self._uri_to_id(str(factor).split('#')[-1])
+                risk_structure[factor_id] = RiskFactor(
+                    name=str(label),
+                    probability=float(probability) if probability else 0.0,
+                    parents=[]
+                )
         
-        # SPARQL 쿼리: 모든 RiskFactor와 CostDriver 가져오기
-        query = """
-        PREFIX risk: <http://shipbuilding.ontology/risk#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?factor ?label ?probability
-        WHERE {
-            {?factor a risk:RiskFactor} UNION {?factor a risk:CostDriver}
-            ?factor rdfs:label ?label .
-            OPTIONAL { ?factor risk:hasProbability ?probability }
-        }
-        """
-        
-        results = self.graph.query(query)
-        
-        for row in results:
-            factor_uri = str(row.factor).split('#')[-1]
-            factor_id = self._uri_to_id(factor_uri)
-            label = str(row.label)
-            prob = float(row.probability) if row.probability else 0.0
-            
-            risk_structure[factor_id] = RiskFactor(
-                name=label,
-                probability=prob,
-                parents=[]
-            )
-        
-        # 부모-자식 관계 쿼리
-        causes_query = """
-        PREFIX risk: <http://shipbuilding.ontology/risk#>
-        
-        SELECT ?parent ?child
-        WHERE {
-            ?parent risk:causes ?child .
-        }
-        """
-        
-        causes_results = self.graph.query(causes_query)
-        
-        for row in causes_results:
-            parent_id = self._uri_to_id(str(row.parent).split('#')[-1])
-            child_id = self._uri_to_id(str(row.child).split('#')[-1])
+        # 부모-자식 관계 (?parent risk:causes ?child)
+        for parent, child in g.subject_objects(_P_CAUSES):
+            parent_id = ids.get(parent) or self._uri_to_id(str(parent).split('#')[-1])
+            child_id = ids.get(child) or self._uri_to_id(str(child).split('#')[-1])
             
             if child_id in risk_structure:
                 risk_structure[child_id].parents.append(parent_id)
@@ -293,45 +450,39 @@ class OntologyConnector:
         """Ontology에서 원가 영향 쿼리"""
         
         if self.source == 'rdf' and RDFLIB_AVAILABLE:
-            cost_impacts = {}
-            
-            query = """
-            PREFIX risk: <http://shipbuilding.ontology/risk#>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-            
-            SELECT ?driver ?label ?cost
-            WHERE {
-                ?driver a risk:CostDriver .
-                ?driver rdfs:label ?label .
-                ?driver risk:hasCostImpact ?cost .
-            }
-            """
-            
-            results = self.graph.query(query)
-            
-            for row in results:
-                driver_id = self._uri_to_id(str(row.driver).split('#')[-1])
-                label = str(row.label)
-                base_cost = float(row.cost)
-                
-                cost_impacts[driver_id] = CostImpact(
-                    factor=label,
-                    base_cost=base_cost,
-                    multiplier_if_triggered=1.5  # 기본값
-                )
-            
-            print(f"[Ontology] Queried {len(cost_impacts)} cost impacts from RDF")
-            return cost_impacts
+            return self._extract_rdf()[1]
         
         else:
             return self._get_sample_cost_impacts()
     
+    def _query_rdf_cost_impacts(self) -> Dict[str, CostImpact]:
+        """RDF Graph에서 트리플 인덱스 스캔으로 원가 영향 추출"""
+        cost_impacts = {}
+        g = self.graph
+        
+        for driver in g.subjects(RDF.type, _C_COST_DRIVER):
+            label = g.value(driver, RDFS.label)
+            cost = g.value(driver, _P_COST)
+            if label is None or cost is None:
+                continue
+            # 발생 시 배수는 Ontology에 정의되어 있으면 사용, 없으면 기본값
+            multiplier = g.value(driver, _P_MULT)
+            
+            driver_id = self._uri_to_id(str(driver).split('#')[-1])
+            cost_impacts[driver_id] = CostImpact(
+                factor=str(label),
+                base_cost=float(cost),
+                multiplier_if_triggered=float(multiplier) if multiplier is not None else 1.5
+            )
+        
+        print(f"[Ontology] Queried {len(cost_impacts)} cost impacts from RDF")
+        return cost_impacts
+    
     def _uri_to_id(self, uri_fragment: str) -> str:
         """URI fragment를 Python identifier로 변환"""
         # MaterialDelay -> material_delay
-        import re
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', uri_fragment)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        s1 = _CAMEL1.sub(r'\1_\2', uri_fragment)
+        return _CAMEL2.sub(r'\1_\2', s1).lower()
     
     def _get_sample_structure(self) -> Dict[str, RiskFactor]:
         """샘플 데이터 (Ontology 없이 테스트용)"""
@@ -381,6 +532,33 @@ class ShipbuildingOntology:
         self.risk_structure = connector.query_risk_structure()
         self.cost_impacts = connector.query_cost_impacts()
         
+        # 요인 이름 -> 정수 ID, 요인별 속성은 ID로 인덱싱하는 병렬 배열로 보관 (SoA)
+        self.factor_names: List[str] = list(self.risk_structure)
+        self.idx: Dict[str, int] = {name: i for i, name in enumerate(self.factor_names)}
+        self.base_prob = np.fromiter((r.probability for r in self.risk_structure.values()),
+                                     dtype=float, count=len(self.factor_names))
+        # 선행요인 ID: (요인 수, 최대 부모 수) 고정 크기 배열, 빈 칸은 -1
+        n_factors = len(self.factor_names)
+        self.n_parents = np.fromiter((len(r.parents) for r in self.risk_structure.values()),
+                                     dtype=np.int32, count=n_factors)
+        max_parents = int(self.n_parents.max()) if n_factors else 0
+        self.parent_idx = np.full((n_factors, max_parents), -1, dtype=np.int32)
+        for i, r in enumerate(self.risk_structure.values()):
+            self.parent_idx[i, :len(r.parents)] = [self.idx[p] for p in r.parents]
+        # 요인별 유효 부모 ID (parent_idx 행의 뷰)
+        self.parents_idx: List[np.ndarray] = [self.parent_idx[i, :k]
+                                              for i, k in enumerate(self.n_parents.tolist())]
+        self.is_root = np.array([not r.parents for r in self.risk_structure.values()], dtype=bool)
+        self.labels: List[str] = [r.name for r in self.risk_structure.values()]
+        
+        # 리스크 구조에 있는 원가 요인의 요인 ID / 기본 비용 / 발생 시 배수
+        # (float32: 2.6, 2.7 같은 값은 정확히 표현되지 않지만 오차 ~1e-7로 0.1 단위 보고 정밀도보다 훨씬 작음)
+        cost_items = [(self.idx[f], c) for f, c in self.cost_impacts.items() if f in self.idx]
+        self.cost_idx = np.array([i for i, _ in cost_items], dtype=np.int32)
+        self.cost_base = np.array([c.base_cost for _, c in cost_items], dtype=np.float32)
+        self.cost_mult = np.array([c.multiplier_if_triggered for _, c in cost_items],
+                                  dtype=np.float32)
+        
         print(f"\n[ShipbuildingOntology] Initialized with {len(self.risk_structure)} risk factors")
         print(f"[ShipbuildingOntology] Loaded {len(self.cost_impacts)} cost impact definitions")
 
@@ -388,6 +566,34 @@ class ShipbuildingOntology:
 # Layer 2: Probabilistic Model - Bayesian Network
 # =============================================================================
 
+def _compute_all_probs(topo_order: List[int], parents_flat: np.ndarray,
+                       parents_offsets: np.ndarray, cpt_flat: np.ndarray,
+                       cpt_offsets: np.ndarray, base_prob: np.ndarray,
+                       evidence_mask: np.ndarray, evidence_val: np.ndarray) -> np.ndarray:
+    """CSR 형태로 평탄화한 구조를 위상 순서대로 한 번 순회하며 전체 확률 계산"""
+    probs = np.where(evidence_mask, evidence_val, base_prob)
+    
+    for i in topo_order:
+        start, end = parents_offsets[i], parents_offsets[i + 1]
+        # 증거가 있거나 Root node이면 초기값 그대로
+        if evidence_mask[i] or start == end:
+            continue
+        
+        p = probs[parents_flat[start:end]]
+        c = cpt_offsets[i]
+        if c < 0:
+            # CPT가 없으면 부모들의 OR 로직으로 근사
+            probs[i] = 1.0 - np.prod(1.0 - p)
+            continue
+        
+        # 조합별 확률 벡터 (j번째 비트 = j번째 부모 발생) 를 외적으로 확장한 뒤 CPT와 내적
+        weights = np.ones(1)
+        for pj in p:
+            weights = np.concatenate((weights * (1.0 - pj), weights * pj))
+        probs[i] = weights @ cpt_flat[c:c + len(weights)]
+    
+    return probs
+
 class BayesianNetworkModel:
     """조건부 확률 기반 베이지안 네트워크"""
     
@@ -398,8 +604,104 @@ class BayesianNetworkModel:
         # 조건부 확률 테이블 (CPT) - 실제로는 과거 데이터로 학습
         self.cpt = self._initialize_cpt()
         
-        # 현재 상태 (증거)
-        self.evidence: Dict[str, bool] = {}
+        # 부모 ID 목록을 CSR 형태 (parents_flat, parents_offsets) 로 평탄화
+        parents_idx = ontology.parents_idx
+        self._parents_offsets = np.zeros(len(parents_idx) + 1, dtype=np.int32)
+        np.cumsum([len(parents) for parents in parents_idx], out=self._parents_offsets[1:])
+        self._parents_flat = (np.concatenate(parents_idx) if parents_idx
+                              else np.zeros(0, dtype=np.int32))
+        
+        # CPT를 부모 상태 비트마스크(j번째 비트 = j번째 부모 발생)로 인덱싱하는 2^k 배열로 변환해
+        # 하나의 배열에 이어 붙이고, 요인별 시작 위치를 기록 (CPT가 없으면 -1)
+        self._cpt_offsets = np.full(len(parents_idx), -1, dtype=np.int32)
+        cpt_chunks = []
+        n_cpt = 0
+        for factor, table in self.cpt.items():
+            if factor not in ontology.idx:
+                continue
+            i = ontology.idx[factor]
+            cpt_chunks.append(self._flatten_cpt(factor, len(parents_idx[i]), table))
+            self._cpt_offsets[i] = n_cpt
+            n_cpt += len(cpt_chunks[-1])
+        self._cpt_flat = np.concatenate(cpt_chunks) if cpt_chunks else np.zeros(0)
+        
+        # 부모가 항상 자식보다 먼저 오는 요인 ID 순서 (한 번만 계산)
+        self._topo_order = self._topological_order()
+        self._topo_list = self._topo_order.tolist()
+        
+        # 증거 상태별 전체 확률 배열 캐시 (LRU, 오래 도는 프로세스에서도 크기 제한)
+        self._prob_cache: OrderedDict = OrderedDict()
+        self._prob_cache_size = 64
+        
+        # 현재 상태 (증거) - 요인 ID별 관측 여부 / 관측값
+        n = len(ontology.factor_names)
+        self.evidence_set = np.zeros(n, dtype=bool)
+        self.evidence_val = np.zeros(n, dtype=bool)
+        self._refresh_evidence_key()
+    
+    @property
+    def evidence(self) -> Mapping[str, bool]:
+        """현재 증거를 {요인: 발생 여부} 읽기 전용 매핑으로 반환 (변경은 update_evidence로)"""
+        names = self.ontology.factor_names
+        return MappingProxyType({names[i]: bool(self.evidence_val[i])
+                                 for i in np.flatnonzero(self.evidence_set)})
+    
+    @evidence.setter
+    def evidence(self, evidence: Dict[str, bool]):
+        # 증거를 통째로 바꾸는 경우 (잘못된 요인 이름이면 기존 증거를 지우기 전에 KeyError)
+        self._check_factors(evidence)
+        self.evidence_set[:] = False
+        self.evidence_val[:] = False
+        for factor, occurred in evidence.items():
+            self.evidence_set[self.ontology.idx[factor]] = True
+            self.evidence_val[self.ontology.idx[factor]] = occurred
+        self._refresh_evidence_key()
+    
+    def _check_factors(self, events: Dict[str, bool]):
+        """리스크 구조에 없는 요인이 있으면 KeyError (일부만 반영되지 않도록 배열을 바꾸기 전에 검사)"""
+        unknown = [factor for factor in events if factor not in self.ontology.idx]
+        if unknown:
+            raise KeyError(f"리스크 구조에 없는 요인: {', '.join(unknown)}")
+    
+    def _refresh_evidence_key(self):
+        """증거 배열이 바뀐 뒤 캐시 키 갱신"""
+        self._evidence_key = (self.evidence_set.tobytes(), self.evidence_val.tobytes())
+    
+    def _flatten_cpt(self, factor: str, k: int, table: Dict[Tuple[bool, ...], float]) -> np.ndarray:
+        """튜플 키 CPT를 비트마스크 인덱스 배열로 변환 (없는 조합은 0)"""
+        arr = np.zeros(2 ** k)
+        for states, prob in table.items():
+            if len(states) != k:
+                raise ValueError(f"{factor} CPT 키 {states}의 길이가 부모 수({k})와 다릅니다")
+            mask = 0
+            for j, state in enumerate(states):
+                if state:
+                    mask |= 1 << j
+            arr[mask] = prob
+        return arr
+    
+    def _topological_order(self) -> np.ndarray:
+        """요인 ID 위상 정렬 (Kahn 알고리즘)"""
+        parents_idx = self.ontology.parents_idx
+        indegree = [len(parents) for parents in parents_idx]
+        children = defaultdict(list)
+        for i, parents in enumerate(parents_idx):
+            for j in parents.tolist():
+                children[j].append(i)
+        
+        queue = deque(i for i, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for child in children[i]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+        
+        if len(order) != len(parents_idx):
+            raise ValueError("리스크 구조에 순환 참조가 있습니다")
+        return np.array(order, dtype=np.int32)
     
     def _initialize_cpt(self) -> Dict[str, Dict]:
         """조건부 확률 테이블 초기화 (과거 데이터 기반이라고 가정)"""
@@ -448,55 +750,61 @@ class BayesianNetworkModel:
             }
         }
     
-    def set_evidence(self, factor: str, occurred: bool):
+    def set_evidence(self, factor: str, occurred: bool, verbose: bool = True):
         """증거 설정 (실제 발생한 이벤트)"""
-        self.evidence[factor] = occurred
-        print(f"[증거 입력] {factor}: {'발생' if occurred else '미발생'}")
+        self.update_evidence({factor: occurred}, verbose=verbose)
+    
+    def update_evidence(self, events: Dict[str, bool], verbose: bool = True):
+        """여러 증거를 한 번에 설정 (증거 배열만 바꾸고 캐시 키는 한 번만 갱신)"""
+        # 확률 캐시는 증거 상태별로 키가 나뉘어 있으므로 비울 필요 없음 (같은 상태로 돌아오면 재사용)
+        self._check_factors(events)
+        for factor, occurred in events.items():
+            i = self.ontology.idx[factor]
+            self.evidence_set[i] = True
+            self.evidence_val[i] = occurred
+            if verbose:
+                print(f"[증거 입력] {factor}: {'발생' if occurred else '미발생'}")
+        self._refresh_evidence_key()
+    
+    @contextmanager
+    def scoped_evidence(self, events: Dict[str, bool]):
+        """with 블록 안에서만 증거를 덧씌우고, 빠져나오면 원래 증거로 복구"""
+        saved = (self.evidence_set.copy(), self.evidence_val.copy())
+        self.update_evidence(events, verbose=False)
+        try:
+            yield self
+        finally:
+            self.evidence_set[:], self.evidence_val[:] = saved
+            self._refresh_evidence_key()
     
     def calculate_probability(self, factor: str) -> float:
         """특정 요인의 발생 확률 계산"""
-        risk = self.risk_structure[factor]
-        
-        # Root node인 경우
-        if not risk.parents:
-            if factor in self.evidence:
-                return 1.0 if self.evidence[factor] else 0.0
-            return risk.probability
-        
-        # 부모가 있는 경우 - 조건부 확률 사용
-        if factor in self.evidence:
-            return 1.0 if self.evidence[factor] else 0.0
-        
-        # 부모 노드들의 상태 조합별로 확률 계산
-        parent_probs = [self.calculate_probability(p) for p in risk.parents]
-        
-        if factor not in self.cpt:
-            # CPT가 없으면 부모들의 OR 로직으로 근사
-            return 1.0 - np.prod([1.0 - p for p in parent_probs])
-        
-        # CPT를 사용한 정확한 계산
-        total_prob = 0.0
-        for i in range(2 ** len(risk.parents)):
-            # 부모들의 모든 조합 생성
-            parent_states = tuple(bool(i & (1 << j)) for j in range(len(risk.parents)))
-            
-            # 이 조합의 확률
-            combination_prob = 1.0
-            for parent, state in zip(risk.parents, parent_states):
-                parent_prob = self.calculate_probability(parent)
-                combination_prob *= parent_prob if state else (1.0 - parent_prob)
-            
-            # 조건부 확률 곱하기
-            if parent_states in self.cpt[factor]:
-                conditional_prob = self.cpt[factor][parent_states]
-                total_prob += combination_prob * conditional_prob
-        
-        return total_prob
+        return float(self.get_probability_vector()[self.ontology.idx[factor]])
+    
+    def get_probability_vector(self) -> np.ndarray:
+        """현재 증거 기준 요인 ID 순서의 전체 확률 배열 (읽기 전용, 증거가 같으면 캐시 재사용)"""
+        probs = self._prob_cache.get(self._evidence_key)
+        if probs is None:
+            probs = self._propagate()
+            self._prob_cache[self._evidence_key] = probs
+            if len(self._prob_cache) > self._prob_cache_size:
+                self._prob_cache.popitem(last=False)
+        else:
+            self._prob_cache.move_to_end(self._evidence_key)
+        return probs
+    
+    def _propagate(self) -> np.ndarray:
+        """현재 증거 배열 기준으로 전체 확률 계산"""
+        probs = _compute_all_probs(self._topo_list, self._parents_flat,
+                                   self._parents_offsets, self._cpt_flat, self._cpt_offsets,
+                                   self.ontology.base_prob, self.evidence_set,
+                                   self.evidence_val.astype(float))
+        probs.flags.writeable = False
+        return probs
     
     def get_all_probabilities(self) -> Dict[str, float]:
         """모든 요인의 현재 확률 계산"""
-        return {name: self.calculate_probability(name) 
-                for name in self.risk_structure.keys()}
+        return dict(zip(self.ontology.factor_names, self.get_probability_vector().tolist()))
 
 # =============================================================================
 # Layer 2: Monte Carlo Simulation Engine
@@ -506,54 +814,94 @@ class MonteCarloSimulator:
     """몬테카를로 시뮬레이션으로 원가 분포 예측"""
     
     def __init__(self, ontology: ShipbuildingOntology, 
-                 bayesian_model: BayesianNetworkModel):
+                 bayesian_model: BayesianNetworkModel,
+                 seed: int = None,
+                 common_random_numbers: bool = True):
         self.ontology = ontology
         self.bayesian_model = bayesian_model
         self.base_cost = 100.0  # 기본 원가 100억원
+        self._rng = np.random.default_rng(seed)  # PCG64 (seed 지정 시 재현 가능)
+        
+        # 시나리오 간 공통 난수 + 대조 변량(u, 1-u) 사용 여부와 재사용할 난수 블록
+        self.common_random_numbers = common_random_numbers
+        self._u_cache: np.ndarray = None
+        # 난수 블록을 새로 뽑을 때마다 증가 (이전 블록으로 계산한 결과 캐시 무효화용)
+        self.crn_generation = 0
+        
+        # 원가 계획 미리 계산: 원가 요인의 샘플 열 번호와 발생 시 추가 원가
+        self._cost_idx = ontology.cost_idx.astype(np.intp)
+        self._cost_weights = ontology.cost_base * ontology.cost_mult
+    
+    def _uniforms(self, n_iterations: int) -> np.ndarray:
+        """(n_iterations x n_factors) 균등난수 - 공통 난수 모드면 시나리오 간 같은 블록 재사용"""
+        k = len(self.ontology.factor_names)
+        if not self.common_random_numbers:
+            return self._rng.random((n_iterations, k), dtype=np.float32)
+        
+        if self._u_cache is None or len(self._u_cache) < n_iterations:
+            # 짝수/홀수 행에 u와 1-u를 번갈아 배치해 앞부분만 잘라 써도 대조 쌍이 유지되도록 함
+            half = self._rng.random(((n_iterations + 1) // 2, k), dtype=np.float32)
+            u = np.empty((2 * len(half), k), dtype=np.float32)
+            u[0::2] = half
+            u[1::2] = 1.0 - half
+            self._u_cache = u
+            self.crn_generation += 1
+        return self._u_cache[:n_iterations]
     
     def run_simulation(self, n_iterations: int = 10000) -> pd.DataFrame:
         """시뮬레이션 실행"""
-        results = []
-        
-        for i in range(n_iterations):
-            # 각 리스크 요인의 발생 여부 샘플링
-            iteration_state = {}
-            for factor in self.bayesian_model.risk_structure.keys():
-                prob = self.bayesian_model.calculate_probability(factor)
-                iteration_state[factor] = np.random.random() < prob
-            
-            # 원가 계산
-            total_cost = self.base_cost
-            cost_breakdown = {'base': self.base_cost}
-            
-            for factor, impact in self.ontology.cost_impacts.items():
-                if factor in iteration_state and iteration_state[factor]:
-                    additional_cost = impact.base_cost * impact.multiplier_if_triggered
-                    total_cost += additional_cost
-                    cost_breakdown[factor] = additional_cost
-                else:
-                    cost_breakdown[factor] = 0.0
-            
-            cost_breakdown['total'] = total_cost
-            cost_breakdown.update(iteration_state)
-            results.append(cost_breakdown)
-        
-        return pd.DataFrame(results)
+        factors = self.ontology.factor_names
+        
+        # 증거가 고정된 동안 각 요인의 확률은 반복마다 같으므로 요인 ID 순서 배열로 한 번에 조회
+        probs = self.bayesian_model.get_probability_vector().astype(np.float32)
+        
+        # 모든 반복의 발생 여부를 한 번에 샘플링 (n_iterations x n_factors)
+        # 난수/확률/원가는 float32 (결과는 소수 첫째 자리까지만 보고하므로 정밀도 충분)
+        samples = self._uniforms(n_iterations) < probs[None, :]
+        
+        # 추가 원가는 미리 계산한 원가 계획으로 한 번의 행렬-벡터 곱
+        total = (samples[:, self._cost_idx].astype(np.float32) @ self._cost_weights
+                 + np.float32(self.base_cost))
+        
+        # 반복별 dict 대신 열 단위 배열로 DataFrame을 한 번에 생성
+        # (원가 요인 열은 위치만 잡아 두고, 리스크 구조에 있는 요인은 아래 발생 여부가 덮어씀 - 기존 동작과 동일)
+        zeros = np.zeros(n_iterations, dtype=np.float32)
+        columns = {'base': np.full(n_iterations, self.base_cost, dtype=np.float32)}
+        for factor in self.ontology.cost_impacts:
+            columns[factor] = zeros
+        columns['total'] = total
+        for j, factor in enumerate(factors):
+            columns[factor] = samples[:, j]
+        
+        return pd.DataFrame(columns)
     
     def analyze_results(self, results: pd.DataFrame) -> Dict:
         """시뮬레이션 결과 분석"""
-        total_costs = results['total']
+        total_costs = np.ascontiguousarray(results['total'].to_numpy())
+        n = len(total_costs)
+        
+        # 한 번만 정렬해서 모든 분위수를 선형 보간으로 계산 (pandas quantile과 동일)
+        sorted_costs = np.sort(total_costs)
+        pos = np.array([0.10, 0.50, 0.90, 0.95]) * (n - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, n - 1)
+        p10, p50, p90, p95 = sorted_costs[lo] + (sorted_costs[hi] - sorted_costs[lo]) * (pos - lo)
+        
+        # 예산 초과 건수도 정렬된 배열에서 이진 탐색으로 계산
+        n_over_10, n_over_20 = n - np.searchsorted(
+            sorted_costs, [self.base_cost * 1.1, self.base_cost * 1.2], side='right')
         
         analysis = {
-            'mean_cost': total_costs.mean(),
-            'median_cost': total_costs.median(),
-            'std_cost': total_costs.std(),
-            'percentile_10': total_costs.quantile(0.10),
-            'percentile_50': total_costs.quantile(0.50),
-            'percentile_90': total_costs.quantile(0.90),
-            'percentile_95': total_costs.quantile(0.95),
-            'prob_over_budget': (total_costs > self.base_cost * 1.1).mean(),
-            'prob_over_budget_20': (total_costs > self.base_cost * 1.2).mean()
+            # 원가 배열은 float32, 합산 누적만 float64로 (큰 반복 수에서도 정밀도 유지)
+            'mean_cost': total_costs.mean(dtype=np.float64),
+            'median_cost': p50,
+            'std_cost': total_costs.std(ddof=1, dtype=np.float64),  # pandas Series.std와 동일한 표본 표준편차
+            'percentile_10': p10,
+            'percentile_50': p50,
+            'percentile_90': p90,
+            'percentile_95': p95,
+            'prob_over_budget': n_over_10 / n,
+            'prob_over_budget_20': n_over_20 / n
         }
         
         return analysis
@@ -565,37 +913,61 @@ class MonteCarloSimulator:
 class DecisionSupportSystem:
     """의사결정 지원 시스템"""
     
-    def __init__(self, ontology: ShipbuildingOntology):
+    def __init__(self, ontology: ShipbuildingOntology, seed: int = None):
         self.ontology = ontology
         self.bayesian_model = BayesianNetworkModel(ontology)
-        self.simulator = MonteCarloSimulator(ontology, self.bayesian_model)
+        # 시나리오들은 같은 난수 블록을 공유하므로 시나리오 간 원가 차이의 분산이 작음
+        self.simulator = MonteCarloSimulator(ontology, self.bayesian_model, seed=seed)
+        
+        # 리포트에 쓰는 요인 ID를 미리 조회 (리스크 구조에 있는 것만)
+        idx = ontology.idx
+        # 원가 영향 요인만 출력
+        cost_factors = ['overtime', 'material_waste', 'equipment_extend', 'rework']
+        self._report_idx = np.array([idx[f] for f in cost_factors if f in idx], dtype=np.intp)
+        # 고위험 시 조치: (요인, 확률 임계값, 권고 문구)
+        actions = [('block_delay', 0.5, "블록 작업에 추가 인력 투입 검토"),
+                   ('material_delay', 0.3, "자재 조달 일정 단축 방안 협의"),
+                   ('overtime', 0.6, "주말 작업 스케줄 최적화")]
+        actions = [a for a in actions if a[0] in idx]
+        self._action_idx = np.array([idx[f] for f, _, _ in actions], dtype=np.intp)
+        self._action_threshold = np.array([t for _, t, _ in actions])
+        self._action_text = [text for _, _, text in actions]
+        
+        # What-if 결과 캐시: (시나리오 증거, 기존 증거, 반복 수, 난수 블록 세대) -> (results, analysis)
+        # 공통 난수 블록이 다시 생성되면 이전 결과는 다른 표본이므로 통째로 비움
+        self._whatif_cache: OrderedDict = OrderedDict()
+        self._whatif_cache_size = 64
+        self._whatif_generation = self.simulator.crn_generation
+        
+        # 기준선(증거 없음) 확률 벡터를 미리 계산해 첫 시나리오에서 전파 비용이 들지 않도록 함
+        self.bayesian_model.get_probability_vector()
     
     def update_status(self, events: Dict[str, bool]):
         """현재 상황 업데이트"""
         print("\n" + "="*60)
         print("현재 프로젝트 상황 업데이트")
         print("="*60)
-        for factor, occurred in events.items():
-            self.bayesian_model.set_evidence(factor, occurred)
+        self.bayesian_model.update_evidence(events)
     
     def analyze_current_risk(self):
         """현재 리스크 분석"""
-        print("\n[현재 리스크 확률 분석]")
-        probs = self.bayesian_model.get_all_probabilities()
-        
-        # 원가 영향 요인만 출력
-        cost_factors = ['overtime', 'material_waste', 'equipment_extend', 'rework']
-        for factor in cost_factors:
-            if factor in probs:
-                print(f"  - {self.bayesian_model.risk_structure[factor].name}: "
-                      f"{probs[factor]*100:.1f}%")
+        probs = self.bayesian_model.get_probability_vector()[self._report_idx] * 100
+        labels = self.ontology.labels
+        print("\n".join(["\n[현재 리스크 확률 분석]",
+                         *(f"  - {labels[i]}: {p:.1f}%"
+                           for i, p in zip(self._report_idx.tolist(), probs.tolist()))]))
     
     def run_cost_simulation(self, n_iterations: int = 10000):
         """원가 시뮬레이션 실행 및 리포트"""
         print(f"\n[몬테카를로 시뮬레이션 실행: {n_iterations:,}회]")
         results = self.simulator.run_simulation(n_iterations)
         analysis = self.simulator.analyze_results(results)
+        self._print_cost_report(analysis)
         
+        return results, analysis
+    
+    def _print_cost_report(self, analysis: Dict):
+        """원가 예측 / 리스크 평가 리포트 출력"""
         print("\n[원가 예측 결과]")
         print(f"  • 평균 예상 원가: {analysis['mean_cost']:.1f}억원")
         print(f"  • 중앙값: {analysis['median_cost']:.1f}억원")
@@ -608,30 +980,48 @@ class DecisionSupportSystem:
         print(f"\n[리스크 평가]")
         print(f"  • 예산 10% 초과 확률: {analysis['prob_over_budget']*100:.1f}%")
         print(f"  • 예산 20% 초과 확률: {analysis['prob_over_budget_20']*100:.1f}%")
-        
-        return results, analysis
     
-    def what_if_analysis(self, scenario_name: str, events: Dict[str, bool]):
-        """What-if 시나리오 분석"""
+    def what_if_analysis(self, scenario_name: str, events: Dict[str, bool],
+                         n_iterations: int = 5000):
+        """What-if 시나리오 분석 (같은 상황의 시나리오는 캐시된 결과 재사용)"""
         print(f"\n{'='*60}")
         print(f"What-If 시나리오: {scenario_name}")
         print("="*60)
         
-        # 기존 상태 백업
-        original_evidence = self.bayesian_model.evidence.copy()
-        
-        # 시나리오 적용
-        for factor, occurred in events.items():
-            self.bayesian_model.set_evidence(factor, occurred)
-        
-        # 분석
-        self.analyze_current_risk()
-        results, analysis = self.run_cost_simulation(5000)
-        
-        # 원상 복구
-        self.bayesian_model.evidence = original_evidence
-        
-        return results, analysis
+        scenario = (frozenset(events.items()),
+                    frozenset(self.bayesian_model.evidence.items()), n_iterations)
+        # 공통 난수를 끈 경우 매번 새 표본이어야 하므로 캐시하지 않음
+        cacheable = self.simulator.common_random_numbers
+        
+        # 시나리오 증거는 분석하는 동안만 적용하고 끝나면 원상 복구
+        with self.bayesian_model.scoped_evidence(events):
+            self.analyze_current_risk()
+            self._sync_whatif_cache()
+            key = scenario + (self._whatif_generation,)
+            cached = self._whatif_cache.get(key) if cacheable else None
+            if cached is None:
+                results, analysis = self.run_cost_simulation(n_iterations)
+                if cacheable:
+                    # 이번 실행에서 난수 블록이 커졌으면 새 세대 키로 저장
+                    self._sync_whatif_cache()
+                    self._whatif_cache[scenario + (self._whatif_generation,)] = (results, analysis)
+                    if len(self._whatif_cache) > self._whatif_cache_size:
+                        self._whatif_cache.popitem(last=False)
+            else:
+                self._whatif_cache.move_to_end(key)
+                results, analysis = cached
+                print(f"\n[몬테카를로 시뮬레이션: 캐시된 {n_iterations:,}회 결과 사용]")
+                self._print_cost_report(analysis)
+        
+        # 호출 측에서 고쳐도 캐시가 오염되지 않도록 사본 반환
+        return results.copy(), dict(analysis)
+    
+    def _sync_whatif_cache(self):
+        """공통 난수 블록이 다시 생성됐으면 이전 세대의 what-if 결과를 버림"""
+        generation = self.simulator.crn_generation
+        if generation != self._whatif_generation:
+            self._whatif_cache.clear()
+            self._whatif_generation = generation
     
     def recommend_actions(self, analysis: Dict):
         """리스크 완화 조치 권고"""
@@ -641,13 +1031,10 @@ class DecisionSupportSystem:
             print("  ⚠️  고위험 상태입니다!")
             print("  → 즉시 대응 필요:")
             
-            probs = self.bayesian_model.get_all_probabilities()
-            if probs.get('block_delay', 0) > 0.5:
-                print("     • 블록 작업에 추가 인력 투입 검토")
-            if probs.get('material_delay', 0) > 0.3:
-                print("     • 자재 조달 일정 단축 방안 협의")
-            if probs.get('overtime', 0) > 0.6:
-                print("     • 주말 작업 스케줄 최적화")
+            probs = self.bayesian_model.get_probability_vector()
+            triggered = probs[self._action_idx] > self._action_threshold
+            for k in np.flatnonzero(triggered).tolist():
+                print(f"     • {self._action_text[k]}")
                 
         elif analysis['prob_over_budget'] > 0.3:
             print("  ⚡ 중위험 상태")
@@ -659,12 +1046,19 @@ class DecisionSupportSystem:
             print("  ✓ 양호한 상태")
             print("  → 현재 계획대로 진행")
     
-    def visualize_results(self, results: pd.DataFrame):
-        """결과 시각화"""
+    def visualize_results(self, results: pd.DataFrame) -> Future:
+        """결과 시각화 - PNG 저장이 끝나면 figure를 돌려주는 Future 반환
+
+        헤드리스 환경에서는 백그라운드 스레드에서 저장하고, 그 외에는 저장/표시 후
+        이미 완료된 Future를 반환. 호출 측은 .result()로 완료를 기다린 뒤 (저장 예외도
+        여기서 발생) 메인 스레드에서 close_figure()로 닫음.
+        """
+        plt = _import_pyplot()
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
         
-        # 1. 총 원가 히스토그램
-        axes[0, 0].hist(results['total'], bins=50, edgecolor='black', alpha=0.7)
+        # 1. 총 원가 히스토그램 (도수는 NumPy로 한 번에 계산해서 계단 형태로 그림)
+        counts, edges = np.histogram(results['total'].to_numpy(), bins=50)
+        axes[0, 0].stairs(counts, edges, fill=True, edgecolor='black', alpha=0.7)
         axes[0, 0].axvline(self.simulator.base_cost, color='green', 
                           linestyle='--', label='기본 원가')
         axes[0, 0].axvline(self.simulator.base_cost * 1.1, color='orange', 
@@ -712,17 +1106,47 @@ class DecisionSupportSystem:
         axes[1, 1].set_title('리스크 요인 발생 빈도')
         axes[1, 1].set_xlim(0, 1)
         
-        plt.tight_layout()
-        plt.savefig('shipbuilding_risk_analysis.png', dpi=150, bbox_inches='tight')
-        print("\n[시각화 완료] 'shipbuilding_risk_analysis.png' 저장됨")
+        fig.tight_layout()
+        
+        if _HEADLESS:
+            # Agg 렌더링은 figure 객체만 다루므로 savefig만 백그라운드 스레드에서 실행
+            # (pyplot 전역 상태를 건드리는 close는 호출 측 메인 스레드에서)
+            return _render_pool().submit(self._save_figure, fig)
+        
+        done = Future()
+        try:
+            done.set_result(self._save_figure(fig))
+        except Exception as e:
+            plt.close(fig)  # 호출 측은 예외만 받으므로 여기서 닫음
+            done.set_exception(e)
+            return done
         plt.show()
+        return done
+    
+    @staticmethod
+    def _save_figure(fig):
+        """figure를 PNG로 저장하고 그대로 반환 (워커 스레드에서도 호출되므로 출력/close 없음)"""
+        fig.savefig('shipbuilding_risk_analysis.png', dpi=150, bbox_inches='tight')
+        return fig
 
 # =============================================================================
 # 실행 예제
 # =============================================================================
 
 def main():
-    """메인 실행 함수"""
+    """메인 실행 함수 (출력은 버퍼에 모았다가 한 번에 기록)"""
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            _main()
+    finally:
+        # 예외가 나도 그때까지의 출력은 남김
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def _main():
+    """시나리오 실행 본문"""
     
     print("="*60)
     print("조선 건조 Risk 관리 시스템 v1.0")
@@ -794,23 +1218,25 @@ def main():
         {'material_delay': True, 'manpower_shortage': False}
     )
     
-    # 비교 분석
-    print("\n\n" + "="*60)
-    print("시나리오 비교 분석")
-    print("="*60)
-    print(f"\n{'시나리오':<20} {'평균원가':>12} {'예산초과확률':>14} {'비용증가':>12}")
-    print("-"*60)
-    print(f"{'1. 정상 상황':<20} {analysis_baseline['mean_cost']:>10.1f}억 "
-          f"{analysis_baseline['prob_over_budget']*100:>12.1f}% {0:>10.1f}억")
-    print(f"{'2. 강재 지연':<20} {analysis_delay['mean_cost']:>10.1f}억 "
-          f"{analysis_delay['prob_over_budget']*100:>12.1f}% "
-          f"{analysis_delay['mean_cost']-analysis_baseline['mean_cost']:>10.1f}억")
-    print(f"{'3. 인력 추가투입':<20} {analysis_whatif['mean_cost']:>10.1f}억 "
-          f"{analysis_whatif['prob_over_budget']*100:>12.1f}% "
-          f"{analysis_whatif['mean_cost']-analysis_baseline['mean_cost']:>10.1f}억")
-    
-    # 시각화
-    dss.visualize_results(results_delay)
+    # 비교 분석: 시나리오별 (평균원가, 예산초과확률%, 비용증가) 를 배열로 모아 한 번에 출력
+    labels = ['1. 정상 상황', '2. 강재 지연', '3. 인력 추가투입']
+    rows = np.array([[a['mean_cost'], a['prob_over_budget'] * 100, a['mean_cost']]
+                     for a in (analysis_baseline, analysis_delay, analysis_whatif)])
+    rows[:, 2] -= rows[0, 0]
+    print("\n".join([
+        "\n\n" + "="*60,
+        "시나리오 비교 분석",
+        "="*60,
+        f"\n{'시나리오':<20} {'평균원가':>12} {'예산초과확률':>14} {'비용증가':>12}",
+        "-"*60,
+        *(f"{label:<20} {mean:>10.1f}억 {prob:>12.1f}% {delta:>10.1f}억"
+          for label, (mean, prob, delta) in zip(labels, rows.tolist())),
+    ]))
+    
+    # 시각화 (matplotlib 로드/렌더링 비용이 크므로 SHIPYARD_PLOT 환경변수를 지정했을 때만)
+    plot_future = None
+    if os.environ.get('SHIPYARD_PLOT'):
+        plot_future = dss.visualize_results(results_delay)
     
     # =========================================================================
     # Ontology 데이터 확인 (디버깅용)
@@ -818,49 +1244,35 @@ def main():
     print("\n\n" + "="*60)
     print("Ontology 데이터 확인")
     print("="*60)
-    print(f"\n[Risk Structure from Ontology]")
-    for risk_id, risk_factor in list(ontology.risk_structure.items())[:5]:
-        print(f"  • {risk_id}: {risk_factor.name}")
-        if risk_factor.parents:
-            print(f"    ↳ 선행요인: {', '.join(risk_factor.parents)}")
-        if risk_factor.probability > 0:
-            print(f"    ↳ 기본확률: {risk_factor.probability*100:.1f}%")
-    
-    print(f"\n[Cost Impact from Ontology]")
+    # 앞의 5개만 보여 주므로 dict 전체를 list(items())로 만들지 않고 요인 ID 범위만 순회
+    # (큰 Ontology에서도 O(5) - 전체 목록을 만드는 슬라이스 패턴을 다시 쓰지 말 것)
+    names = ontology.factor_names
+    lines = ["\n[Risk Structure from Ontology]"]
+    for i in range(min(5, len(names))):
+        lines.append(f"  • {names[i]}: {ontology.labels[i]}")
+        if not ontology.is_root[i]:
+            parents = ontology.parent_idx[i, :ontology.n_parents[i]].tolist()
+            lines.append(f"    ↳ 선행요인: {', '.join(names[j] for j in parents)}")
+        if ontology.base_prob[i] > 0:
+            lines.append(f"    ↳ 기본확률: {ontology.base_prob[i]*100:.1f}%")
+    
+    lines.append("\n[Cost Impact from Ontology]")
     for cost_id, cost_impact in ontology.cost_impacts.items():
-        print(f"  • {cost_id}: {cost_impact.factor}")
-        print(f"    ↳ 기본비용: {cost_impact.base_cost}억원, "
-              f"발생시 배수: {cost_impact.multiplier_if_triggered}x")
+        lines.append(f"  • {cost_id}: {cost_impact.factor}")
+        lines.append(f"    ↳ 기본비용: {cost_impact.base_cost}억원, "
+                     f"발생시 배수: {cost_impact.multiplier_if_triggered}x")
+    print("\n".join(lines))
+    
+    # 백그라운드 저장 완료 대기 (savefig 예외도 여기서 다시 발생)
+    if plot_future is not None:
+        close_figure(plot_future.result())
+        print(_PLOT_DONE_MSG)
     
     print("\n\n프로그램 종료")
 
 
-def demo_ontology_creation():
-    """
-    Ontology 파일 생성 데모
-    실제로는 Protégé, TopBraid Composer 등의 툴로 작성
-    """
-    print("="*60)
-    print("조선 Risk Ontology 생성 데모 (RDF/Turtle 형식)")
-    print("="*60)
-    
-    if not RDFLIB_AVAILABLE:
-        print("\n[Error] rdflib 설치 필요: pip install rdflib")
-        return
-    
-    # Sample ontology 생성
-    connector = OntologyConnector(ontology_source='rdf')
-    
-    # Turtle 형식으로 저장
-    output_file = 'shipbuilding_risk_ontology.ttl'
-    connector.graph.serialize(destination=output_file, format='turtle')
-    
-    print(f"\n[Success] Ontology 저장 완료: {output_file}")
-    print(f"총 {len(connector.graph)} triples")
-    
-    print("\n[생성된 Ontology 미리보기]")
-    print("-"*60)
-    sample_ttl = """
+# demo_ontology_creation에서 보여 주는 Ontology 미리보기 (호출마다 다시 만들지 않도록 모듈 상수)
+SAMPLE_TTL = """
 @prefix risk: <http://shipbuilding.ontology/risk#> .
 @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
 @prefix owl: <http://www.w3.org/2002/07/owl#> .
@@ -887,7 +1299,34 @@ risk:Overtime a risk:CostDriver ;
     rdfs:label "특근투입" ;
     risk:hasCostImpact 3.0 .
     """
-    print(sample_ttl)
+
+
+def demo_ontology_creation():
+    """
+    Ontology 파일 생성 데모
+    실제로는 Protégé, TopBraid Composer 등의 툴로 작성
+    """
+    print("="*60)
+    print("조선 Risk Ontology 생성 데모 (RDF/Turtle 형식)")
+    print("="*60)
+    
+    if not RDFLIB_AVAILABLE:
+        print("\n[Error] rdflib 설치 필요: pip install rdflib")
+        return
+    
+    # Sample ontology 생성
+    connector = OntologyConnector(ontology_source='rdf')
+    
+    # Turtle 형식으로 저장
+    output_file = 'shipbuilding_risk_ontology.ttl'
+    connector.graph.serialize(destination=output_file, format='turtle')
+    
+    print(f"\n[Success] Ontology 저장 완료: {output_file}")
+    print(f"총 {len(connector.graph)} triples")
+    
+    print("\n[생성된 Ontology 미리보기]")
+    print("-"*60)
+    print(SAMPLE_TTL)
     print("-"*60)
     
     print("\n[사용 방법]")
@@ -4,27 +4,116 @@ A comprehensive ontology for managing smart shipyard operations including
 IoT sensors, manufacturing processes, ship components, and workforce management.
 
 Install: pip install owlready2 rdflib
+Owlready2's compiled parser (owlready2_optimized) ships with the binary wheels;
+when building from source use: pip install Cython && pip install --no-binary owlready2 owlready2
 """
 
 from owlready2 import *
+from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+import hashlib
+import os
 import random
+import sys
+import tempfile
 from typing import Any
 
+# Section rules used by the console reports
+_RULE = "=" * 80
+_HEADER_RULE = "\n" + _RULE
+
+# Without the Cython extension owlready2 silently falls back to its pure-Python
+# parser, which makes loading/saving the ontology several times slower.
+try:
+    import owlready2_optimized
+    OWLREADY2_OPTIMIZED = True
+except ImportError:
+    OWLREADY2_OPTIMIZED = False
+    print("Warning: owlready2_optimized is not available; owlready2 is using its slow "
+          "pure-Python parser. Reinstall with: pip install Cython && "
+          "pip install --no-binary owlready2 owlready2", file=sys.stderr)
+
 
 # ============================================================================
 # SMART SHIPYARD ONTOLOGY CREATION
 # ============================================================================
 
+# Status individuals: (individual name, display name)
+STATUS_VALUES = [
+    ("UnderConstruction", "Under Construction"),
+    ("InProgress", "In Progress"),
+    ("Scheduled", "Scheduled"),
+    ("Completed", "Completed"),
+    ("Pending", "Pending"),
+    ("Operational", "Operational"),
+]
+
+def _source_digest():
+    """Short hash of this module's source, so each schema version gets its own cache file."""
+    with open(__file__, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+# The schema (classes and properties) is static, so it is saved once after being
+# built and reloaded on later runs. The file name is keyed on this module's source,
+# so checkouts with different schemas sharing ~/.cache never load each other's cache.
+SCHEMA_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "smartshipyard")
+SCHEMA_CACHE = os.path.join(SCHEMA_CACHE_DIR, f"shipyard_schema_{_source_digest()}.owl")
+
+
+def _load_schema_cache(onto):
+    """Load the cached schema into onto; return False if it is missing or unreadable."""
+    try:
+        with open(SCHEMA_CACHE, "rb") as f:
+            onto.load(fileobj=f)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"Ignoring unreadable schema cache {SCHEMA_CACHE}: {e}")
+        return False
+    return True
+
+
+def _save_schema_cache(onto):
+    """Save the freshly built schema for later runs."""
+    try:
+        os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+    except OSError as e:
+        print(f"Could not write schema cache {SCHEMA_CACHE}: {e}")
+        return
+    # Write to a temp file and rename it into place, so concurrent readers never
+    # see a half-written cache
+    fd, tmp_path = tempfile.mkstemp(dir=SCHEMA_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            onto.save(file=f, format="rdfxml")
+        os.replace(tmp_path, SCHEMA_CACHE)
+    except Exception as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        print(f"Could not write schema cache {SCHEMA_CACHE}: {e}")
+
+
 def create_smart_shipyard_ontology():
     """Create a comprehensive smart shipyard ontology."""
     
-    print("\n" + "="*80)
+    print(_HEADER_RULE)
     print("CREATING SMART SHIPYARD ONTOLOGY")
-    print("="*80)
+    print(_RULE)
     
     # Create ontology
     onto = get_ontology("https://raw.githubusercontent.com/bedro96/smartshipyard/refs/heads/main/smart_shipyard.owl")
+    # Lookup indexes filled as individuals are created (see _create_entity)
+    onto._by_id = {}
+    onto._by_name = {}
+    
+    if _load_schema_cache(onto):
+        print("✓ Ontology structure loaded from cache")
+        return onto
     
     with onto:
         # ====================================================================
@@ -263,13 +352,21 @@ def create_smart_shipyard_ontology():
             """AI/ML system for optimization"""
             pass
         
+        # ====================================================================
+        # STATUS VALUES
+        # ====================================================================
+        
+        class Status(Thing):
+            """Status of a vessel, piece of equipment or process"""
+            pass
+        
         # ====================================================================
         # OBJECT PROPERTIES (RELATIONSHIPS)
         # ====================================================================
         
-        class locatedIn(ObjectProperty):
+        class locatedIn(ObjectProperty, FunctionalProperty):
             """Physical location relationship"""
-            domain = [PhysicalAsset | Equipment | Person]
+            domain = [PhysicalAsset | Equipment | Person | Sensor | Material]
             range = [ShipyardFacility]
         
         class partOf(ObjectProperty):
@@ -280,7 +377,7 @@ def create_smart_shipyard_ontology():
         class installedOn(ObjectProperty, FunctionalProperty):
             """Sensor installation"""
             domain = [Sensor]
-            range = [PhysicalAsset | Equipment]
+            range = [PhysicalAsset | Equipment | ShipyardFacility]
         
         class operatedBy(ObjectProperty, FunctionalProperty):
             """Equipment operation"""
@@ -321,10 +418,11 @@ def create_smart_shipyard_ontology():
             """Management relationship"""
             domain = [DigitalSystem]
             range = [Process | Equipment | Material]
-            
-        class installedOn(ObjectProperty, FunctionalProperty):
-            domain = [Sensor]
-            range = [PhysicalAsset | Equipment | ShipyardFacility]
+        
+        class hasStatus(ObjectProperty, FunctionalProperty):
+            """Operational status"""
+            domain = [Equipment | Process | Vessel]
+            range = [Status]
         
         # ====================================================================
         # DATA PROPERTIES (ATTRIBUTES)
@@ -338,14 +436,6 @@ def create_smart_shipyard_ontology():
             domain = [Thing]
             range = [str]
         
-        class hasStatus(DataProperty, FunctionalProperty):
-            """Operational status"""
-            domain = [Equipment | Process | Vessel]
-            range = [str]
-        
-        class locatedAt(DataProperty, FunctionalProperty):
-            domain = [PhysicalAsset | Equipment | Sensor]
-            range = [str]
         class hasCapacity(DataProperty, FunctionalProperty):
             """Capacity specification"""
             domain = [Equipment | ShipyardFacility]
@@ -411,6 +501,22 @@ def create_smart_shipyard_ontology():
             domain = [VesselComponent | Process]
             range = [float]
         
+        class hasAggregateQualityScore(DataProperty, FunctionalProperty):
+            """Mean quality score of the vessel's components (derived)"""
+            domain = [Vessel]
+            range = [float]
+        
+        class hasAggregateComputedAt(DataProperty, FunctionalProperty):
+            """When the derived aggregates were last computed"""
+            domain = [Vessel]
+            range = [str]
+        
+        # Status values are shared individuals, so filtering by status follows
+        # one indexed edge instead of comparing strings on every entity
+        for status_name, label in STATUS_VALUES:
+            Status(status_name, hasName=label)
+        
+    _save_schema_cache(onto)
     print("✓ Ontology structure created")
     return onto
 
@@ -419,635 +525,693 @@ def create_smart_shipyard_ontology():
 # POPULATE WITH SAMPLE DATA
 # ============================================================================
 
+# Placeholder in SAMPLE_ENTITIES for the time the data is populated
+LOAD_TIME = object()
+
+# Sample individuals: OWL class, individual name, hasID, hasName and other data properties
+SAMPLE_ENTITIES = [
+    # Facilities
+    {"cls": "DryDock", "name": "DryDock_01", "id": "DD-001", "label": "Main Dry Dock 1",
+     "props": {"hasCapacity": 150000.0}},  # tonnage
+    {"cls": "DryDock", "name": "DryDock_02", "id": "DD-002", "label": "Dry Dock 2",
+     "props": {"hasCapacity": 100000.0}},  # tonnage
+    {"cls": "WeldingStation", "name": "WeldingShop_01", "id": "WS-001", "label": "Primary Welding Station"},
+    {"cls": "PaintingStation", "name": "PaintingShop_01", "id": "PS-001", "label": "Coating and Painting Station"},
+    {"cls": "AssemblyStation", "name": "AssemblyShop_01", "id": "AS-001", "label": "Main Assembly Station"},
+    {"cls": "Warehouse", "name": "Warehouse_01", "id": "WH-001", "label": "Materials Warehouse",
+     "props": {"hasCapacity": 5000.0}},  # square meters
+    {"cls": "ShipyardFacility", "name": "Office_01", "id": "OF-001", "label": "Shipyard Management Office"},
+
+    # Vessels under construction
+    {"cls": "Vessel", "name": "Vessel_Container_001", "id": "V-CS-001", "label": "Container Ship Pacific Star",
+     "props": {"hasVesselType": "Container Ship", "hasLength": 350.0,  # meters
+               "hasDeadweight": 145000.0,  # tons
+               "hasCompletionPercentage": 65.0}},
+    {"cls": "Vessel", "name": "Vessel_Tanker_001", "id": "V-TK-001", "label": "Oil Tanker Atlantic Pride",
+     "props": {"hasVesselType": "Oil Tanker", "hasLength": 280.0, "hasDeadweight": 95000.0,
+               "hasCompletionPercentage": 40.0}},
+
+    # Vessel components
+    {"cls": "Hull", "name": "Hull_V001", "id": "H-V001", "label": "Hull - Pacific Star",
+     "props": {"hasQualityScore": 95.5}},
+    {"cls": "Engine", "name": "Engine_V001", "id": "E-V001", "label": "Main Engine - Pacific Star",
+     "props": {"hasQualityScore": 98.0}},
+    {"cls": "NavigationSystem", "name": "NavSystem_V001", "id": "NS-V001", "label": "Navigation System - Pacific Star"},
+    {"cls": "ElectricalSystem", "name": "ElecSystem_V001", "id": "ES-V001", "label": "Electrical System - Pacific Star"},
+
+    # Equipment
+    {"cls": "Crane", "name": "Crane_001", "id": "CR-001", "label": "Gantry Crane 1",
+     "props": {"hasCapacity": 500.0}},  # tons
+    {"cls": "WeldingRobot", "name": "WeldRobot_001", "id": "WR-001", "label": "Automated Welding Robot 1"},
+    {"cls": "CuttingMachine", "name": "CuttingMachine_001", "id": "CM-001", "label": "Plasma Cutting Machine"},
+
+    # IoT sensors
+    {"cls": "TemperatureSensor", "name": "TempSensor_WR001", "id": "TS-WR001", "label": "Temperature Sensor - Welding Robot 1",
+     "props": {"hasTemperature": 45.5, "hasTimestamp": LOAD_TIME}},
+    {"cls": "VibrationSensor", "name": "VibSensor_CR001", "id": "VS-CR001", "label": "Vibration Sensor - Crane 1",
+     "props": {"hasVibration": 2.3, "hasTimestamp": LOAD_TIME}},
+    {"cls": "PositionSensor", "name": "PosSensor_V001", "id": "PS-V001", "label": "Position Tracker - Pacific Star",
+     "props": {"hasCoordinates": "37.8267° N, 122.4233° W"}},
+    {"cls": "SafetySensor", "name": "SafetySensor_WS001", "id": "SS-WS001", "label": "Gas Detection - Welding Shop"},
+    {"cls": "QualitySensor", "name": "QualitySensor_H001", "id": "QS-H001", "label": "Ultrasonic Tester - Hull"},
+
+    # Workforce
+    {"cls": "Welder", "name": "Welder_001", "id": "W-001", "label": "John Smith",
+     "props": {"hasExperience": 15,  # years
+               "hasCertification": ["AWS D1.1", "6G Position"]}},
+    {"cls": "Welder", "name": "Welder_002", "id": "W-002", "label": "Maria Garcia",
+     "props": {"hasExperience": 12, "hasCertification": ["AWS D1.1"]}},
+    {"cls": "Electrician", "name": "Electrician_001", "id": "E-001", "label": "David Chen",
+     "props": {"hasExperience": 10, "hasCertification": ["Master Electrician", "Marine Systems"]}},
+    {"cls": "Painter", "name": "Painter_001", "id": "P-001", "label": "Ahmed Hassan",
+     "props": {"hasExperience": 8, "hasCertification": ["NACE Coating Inspector"]}},
+    {"cls": "Engineer", "name": "Engineer_001", "id": "ENG-001", "label": "Dr. Sarah Johnson",
+     "props": {"hasExperience": 20, "hasCertification": ["Naval Architect", "PE License"]}},
+    {"cls": "QualityInspector", "name": "Inspector_001", "id": "QI-001", "label": "Robert Lee",
+     "props": {"hasExperience": 18, "hasCertification": ["ASNT Level III", "ISO 9001 Lead Auditor"]}},
+    {"cls": "SafetyOfficer", "name": "SafetyOfficer_001", "id": "SO-001", "label": "Lisa Brown",
+     "props": {"hasExperience": 12, "hasCertification": ["OSHA 30", "CSP"]}},
+    {"cls": "Manager", "name": "Manager_001", "id": "MGR-001", "label": "Michael Anderson",
+     "props": {"hasExperience": 25}},
+
+    # Processes
+    {"cls": "WeldingProcess", "name": "WeldingProc_H001", "id": "WP-H001", "label": "Hull Welding - Section A",
+     "props": {"hasCompletionPercentage": 75.0, "hasPriority": "High", "hasTemperature": 850.0}},
+    {"cls": "AssemblyProcess", "name": "AssemblyProc_E001", "id": "AP-E001", "label": "Engine Installation",
+     "props": {"hasCompletionPercentage": 0.0, "hasPriority": "Medium"}},
+    {"cls": "InspectionProcess", "name": "InspectionProc_H001", "id": "IP-H001", "label": "Hull Quality Inspection",
+     "props": {"hasCompletionPercentage": 100.0}},
+    {"cls": "PaintingProcess", "name": "PaintingProc_V001", "id": "PP-V001", "label": "Hull Surface Coating",
+     "props": {"hasCompletionPercentage": 0.0, "hasPriority": "Low"}},
+
+    # Materials
+    {"cls": "SteelPlate", "name": "SteelPlate_Stock", "id": "MAT-SP-001", "label": "High-Strength Steel Plates",
+     "props": {"hasQuantity": 500}},  # units
+    {"cls": "WeldingRod", "name": "WeldingRod_Stock", "id": "MAT-WR-001", "label": "E7018 Welding Electrodes",
+     "props": {"hasQuantity": 10000}},
+    {"cls": "Paint", "name": "Paint_Stock", "id": "MAT-PT-001", "label": "Marine Grade Anti-Fouling Paint",
+     "props": {"hasQuantity": 5000}},  # liters
+    {"cls": "ElectricalCable", "name": "Cable_Stock", "id": "MAT-EC-001", "label": "Marine Grade Electrical Cable",
+     "props": {"hasQuantity": 15000}},  # meters
+
+    # Digital systems
+    {"cls": "MES", "name": "MES_System", "id": "DIG-MES-001", "label": "Manufacturing Execution System"},
+    {"cls": "ERP", "name": "ERP_System", "id": "DIG-ERP-001", "label": "Enterprise Resource Planning"},
+    {"cls": "DigitalTwin", "name": "DigitalTwin_V001", "id": "DIG-DT-V001", "label": "Digital Twin - Pacific Star"},
+    {"cls": "AISystem", "name": "AI_Optimization", "id": "DIG-AI-001", "label": "AI Production Optimizer"},
+]
+
+# Relationships, set once every individual exists: (subject, property, object or list of objects).
+# Objects are SAMPLE_ENTITIES or STATUS_VALUES names.
+SAMPLE_LINKS = [
+    # Vessels under construction
+    ("Vessel_Container_001", "hasStatus", "UnderConstruction"),
+    ("Vessel_Container_001", "locatedIn", "DryDock_01"),
+    ("Vessel_Tanker_001", "hasStatus", "UnderConstruction"),
+    ("Vessel_Tanker_001", "locatedIn", "DryDock_02"),
+
+    # Vessel components
+    ("Hull_V001", "partOf", ["Vessel_Container_001"]),
+    ("Engine_V001", "partOf", ["Vessel_Container_001"]),
+    ("NavSystem_V001", "partOf", ["Vessel_Container_001"]),
+    ("ElecSystem_V001", "partOf", ["Vessel_Container_001"]),
+
+    # Equipment
+    ("Crane_001", "hasStatus", "Operational"),
+    ("Crane_001", "locatedIn", "DryDock_01"),
+    ("WeldRobot_001", "hasStatus", "Operational"),
+    ("WeldRobot_001", "locatedIn", "WeldingShop_01"),
+    ("CuttingMachine_001", "hasStatus", "Operational"),
+    ("CuttingMachine_001", "locatedIn", "AssemblyShop_01"),
+
+    # IoT sensors
+    ("TempSensor_WR001", "installedOn", "WeldRobot_001"),
+    ("TempSensor_WR001", "monitors", "WeldRobot_001"),
+    ("VibSensor_CR001", "installedOn", "Crane_001"),
+    ("VibSensor_CR001", "monitors", "Crane_001"),
+    ("PosSensor_V001", "installedOn", "Vessel_Container_001"),
+    ("PosSensor_V001", "monitors", "Vessel_Container_001"),
+    ("SafetySensor_WS001", "installedOn", "WeldingShop_01"),
+    ("SafetySensor_WS001", "monitors", "WeldingShop_01"),
+    ("QualitySensor_H001", "installedOn", "Hull_V001"),
+    ("QualitySensor_H001", "monitors", "Hull_V001"),
+
+    # Workforce
+    ("Welder_001", "locatedIn", "WeldingShop_01"),
+    ("Welder_002", "locatedIn", "WeldingShop_01"),
+    ("Electrician_001", "locatedIn", "DryDock_01"),
+    ("Painter_001", "locatedIn", "PaintingShop_01"),
+    ("Manager_001", "locatedIn", "Office_01"),
+
+    # Processes
+    ("WeldingProc_H001", "hasStatus", "InProgress"),
+    ("WeldingProc_H001", "operatedBy", "Welder_001"),
+    ("WeldingProc_H001", "supervisedBy", "Engineer_001"),
+    ("WeldingProc_H001", "produces", "Hull_V001"),
+    ("WeldingProc_H001", "requires", "WeldRobot_001"),
+    ("AssemblyProc_E001", "hasStatus", "Scheduled"),
+    ("AssemblyProc_E001", "supervisedBy", "Engineer_001"),
+    ("AssemblyProc_E001", "produces", "Vessel_Container_001"),
+    ("AssemblyProc_E001", "requires", "Crane_001"),
+    ("InspectionProc_H001", "hasStatus", "Completed"),
+    ("InspectionProc_H001", "inspectedBy", "Inspector_001"),
+    ("PaintingProc_V001", "hasStatus", "Pending"),
+    ("PaintingProc_V001", "operatedBy", "Painter_001"),
+    ("PaintingProc_V001", "produces", "Hull_V001"),
+
+    # Materials
+    ("SteelPlate_Stock", "locatedIn", "Warehouse_01"),
+    ("SteelPlate_Stock", "usedIn", "WeldingProc_H001"),
+    ("WeldingRod_Stock", "locatedIn", "Warehouse_01"),
+    ("WeldingRod_Stock", "usedIn", "WeldingProc_H001"),
+    ("Paint_Stock", "locatedIn", "Warehouse_01"),
+    ("Paint_Stock", "usedIn", "PaintingProc_V001"),
+    ("Cable_Stock", "locatedIn", "Warehouse_01"),
+
+    # Digital systems
+    ("MES_System", "manages", ["WeldingProc_H001", "AssemblyProc_E001", "PaintingProc_V001"]),
+    ("ERP_System", "manages", ["SteelPlate_Stock", "WeldingRod_Stock", "Paint_Stock", "Cable_Stock"]),
+    ("AI_Optimization", "manages", ["WeldingProc_H001", "AssemblyProc_E001"]),
+]
+
+
+def _create_entity(onto, cls, name, entity_id, label):
+    """Create an individual and register it in the ID/name lookup indexes."""
+    entity = cls(name)
+    entity.hasName = label
+    entity.hasID = entity_id
+    onto._by_id[entity_id] = entity
+    onto._by_name[label] = entity
+    return entity
+
+
+def _load_entity(onto, spec, now):
+    """Create one individual from a SAMPLE_ENTITIES row."""
+    entity = _create_entity(onto, getattr(onto, spec["cls"]), spec["name"], spec["id"], spec["label"])
+    for prop, value in spec.get("props", {}).items():
+        setattr(entity, prop, now if value is LOAD_TIME else value)
+    return entity
+
+
+def get_entity_by_id(onto, entity_id):
+    """Return the individual with the given hasID, or None."""
+    return onto._by_id.get(entity_id)
+
+
+def get_entity_by_name(onto, name):
+    """Return the individual with the given hasName, or None."""
+    return onto._by_name.get(name)
+
+
 def populate_shipyard_data(onto):
     """Populate the ontology with realistic shipyard data."""
     
     print("\nPopulating with sample data...")
     
+    # All readings in this load share one timestamp
+    now = datetime.now().isoformat()
+    
     with onto:
-        # ====================================================================
-        # CREATE FACILITIES
-        # ====================================================================
-        
-        drydock1 = onto.DryDock("DryDock_01")
-        drydock1.hasName = "Main Dry Dock 1"
-        drydock1.hasID = "DD-001"
-        drydock1.hasCapacity = 150000.0  # tonnage
-        
-        drydock2 = onto.DryDock("DryDock_02")
-        drydock2.hasName = "Dry Dock 2"
-        drydock2.hasID = "DD-002"
-        drydock2.hasCapacity = 100000.0  # tonnage
-        
-        welding_shop = onto.WeldingStation("WeldingShop_01")
-        welding_shop.hasName = "Primary Welding Station"
-        welding_shop.hasID = "WS-001"
-        
-        painting_shop = onto.PaintingStation("PaintingShop_01")
-        painting_shop.hasName = "Coating and Painting Station"
-        painting_shop.hasID = "PS-001"
-        
-        assembly_shop = onto.AssemblyStation("AssemblyShop_01")
-        assembly_shop.hasName = "Main Assembly Station"
-        assembly_shop.hasID = "AS-001"
-
-        warehouse1 = onto.Warehouse("Warehouse_01")
-        warehouse1.hasName = "Materials Warehouse"
-        warehouse1.hasID = "WH-001"
-        warehouse1.hasCapacity = 5000.0  # square meters
-        
-        # ====================================================================
-        # CREATE VESSELS UNDER CONSTRUCTION
-        # ====================================================================
-        
-        vessel1 = onto.Vessel("Vessel_Container_001")
-        vessel1.hasName = "Container Ship Pacific Star"
-        vessel1.hasID = "V-CS-001"
-        vessel1.hasVesselType = "Container Ship"
-        vessel1.hasLength = 350.0  # meters   
-        vessel1.hasDeadweight = 145000.0  # tons
-        vessel1.hasCompletionPercentage = 65.0
-        vessel1.hasStatus = "Under Construction"
-        vessel1.locatedAt = "drydock1"
-        
-        vessel2 = onto.Vessel("Vessel_Tanker_001")
-        vessel2.hasName = "Oil Tanker Atlantic Pride"
-        vessel2.hasID = "V-TK-001"
-        vessel2.hasVesselType = "Oil Tanker"
-        vessel2.hasLength = 280.0
-        vessel2.hasDeadweight = 95000.0
-        vessel2.hasCompletionPercentage = 40.0
-        vessel2.hasStatus = "Under Construction"
-        vessel2.locatedAt = "drydock2"
-        
-        # ====================================================================
-        # CREATE VESSEL COMPONENTS
-        # ====================================================================
-        
-        hull1 = onto.Hull("Hull_V001")
-        hull1.hasName = "Hull - Pacific Star"
-        hull1.hasID = "H-V001"
-        hull1.partOf.append(vessel1)
-        hull1.hasQualityScore = 95.5
-        
-        engine1 = onto.Engine("Engine_V001")
-        engine1.hasName = "Main Engine - Pacific Star"
-        engine1.hasID = "E-V001"
-        engine1.partOf.append(vessel1)
-        engine1.hasQualityScore = 98.0
-        
-        nav_system1 = onto.NavigationSystem("NavSystem_V001")
-        nav_system1.hasName = "Navigation System - Pacific Star"
-        nav_system1.hasID = "NS-V001"
-        nav_system1.partOf.append(vessel1)
-        
-        electrical1 = onto.ElectricalSystem("ElecSystem_V001")
-        electrical1.hasName = "Electrical System - Pacific Star"
-        electrical1.hasID = "ES-V001"
-        electrical1.partOf.append(vessel1)
+        objs = {name: onto[name] for name, _ in STATUS_VALUES}
+        objs.update((spec["name"], _load_entity(onto, spec, now)) for spec in SAMPLE_ENTITIES)
         
-        # ====================================================================
-        # CREATE EQUIPMENT
-        # ====================================================================
-        
-        crane1 = onto.Crane("Crane_001")
-        crane1.hasName = "Gantry Crane 1"
-        crane1.hasID = "CR-001"
-        crane1.hasCapacity = 500.0  # tons
-        crane1.hasStatus = "Operational"
-        crane1.locatedAt = "drydock1"
-        
-        welding_robot1 = onto.WeldingRobot("WeldRobot_001")
-        welding_robot1.hasName = "Automated Welding Robot 1"
-        welding_robot1.hasID = "WR-001"
-        welding_robot1.hasStatus = "Operational"
-        welding_robot1.locatedAt = "welding_shop"
-        
-        cutting_machine1 = onto.CuttingMachine("CuttingMachine_001")
-        cutting_machine1.hasName = "Plasma Cutting Machine"
-        cutting_machine1.hasID = "CM-001"
-        cutting_machine1.hasStatus = "Operational"
-        cutting_machine1.locatedAt = "assembly_shop"
-        
-        # ====================================================================
-        # CREATE IoT SENSORS
-        # ====================================================================
-        
-        temp_sensor1 = onto.TemperatureSensor("TempSensor_WR001")
-        temp_sensor1.hasName = "Temperature Sensor - Welding Robot 1"
-        temp_sensor1.hasID = "TS-WR001"
-        temp_sensor1.installedOn = welding_robot1
-        temp_sensor1.monitors = welding_robot1
-        temp_sensor1.hasTemperature = 45.5
-        temp_sensor1.hasTimestamp = datetime.now().isoformat()
-        
-        vib_sensor1 = onto.VibrationSensor("VibSensor_CR001")
-        vib_sensor1.hasName = "Vibration Sensor - Crane 1"
-        vib_sensor1.hasID = "VS-CR001"
-        vib_sensor1.installedOn = crane1
-        vib_sensor1.monitors = crane1
-        vib_sensor1.hasVibration = 2.3
-        vib_sensor1.hasTimestamp = datetime.now().isoformat()
-        
-        pos_sensor1 = onto.PositionSensor("PosSensor_V001")
-        pos_sensor1.hasName = "Position Tracker - Pacific Star"
-        pos_sensor1.hasID = "PS-V001"
-        pos_sensor1.installedOn = vessel1
-        pos_sensor1.monitors = vessel1
-        pos_sensor1.hasCoordinates = "37.8267° N, 122.4233° W"
-        
-        safety_sensor1 = onto.SafetySensor("SafetySensor_WS001")
-        safety_sensor1.hasName = "Gas Detection - Welding Shop"
-        safety_sensor1.hasID = "SS-WS001"
-        safety_sensor1.installedOn = welding_shop
-        safety_sensor1.monitors = welding_shop
-        
-        quality_sensor1 = onto.QualitySensor("QualitySensor_H001")
-        quality_sensor1.hasName = "Ultrasonic Tester - Hull"
-        quality_sensor1.hasID = "QS-H001"
-        quality_sensor1.installedOn = hull1
-        quality_sensor1.monitors = hull1
-        
-        # ====================================================================
-        # CREATE WORKFORCE
-        # ====================================================================
-        
-        welder1 = onto.Welder("Welder_001")
-        welder1.hasName = "John Smith"
-        welder1.hasID = "W-001"
-        welder1.hasExperience = 15  # years
-        welder1.hasCertification = ["AWS D1.1", "6G Position"]
-        welder1.locatedAt = "welding_shop"
-        
-        welder2 = onto.Welder("Welder_002")
-        welder2.hasName = "Maria Garcia"
-        welder2.hasID = "W-002"   
-        welder2.hasExperience = 12
-        welder2.hasCertification = ["AWS D1.1"]
-        welder2.locatedAt = "welding_shop"
-        
-        electrician1 = onto.Electrician("Electrician_001")
-        electrician1.hasName = "David Chen"
-        electrician1.hasID = "E-001"
-        electrician1.hasExperience = 10
-        electrician1.hasCertification = ["Master Electrician", "Marine Systems"]
-        electrician1.locatedAt = "drydock1"
-        
-        painter1 = onto.Painter("Painter_001")
-        painter1.hasName = "Ahmed Hassan"
-        painter1.hasID = "P-001"  
-        painter1.hasExperience = 8
-        painter1.hasCertification = ["NACE Coating Inspector"]
-        painter1.locatedAt = "painting_shop"
-        
-        engineer1 = onto.Engineer("Engineer_001")
-        engineer1.hasName = "Dr. Sarah Johnson"
-        engineer1.hasID = "ENG-001"
-        engineer1.hasExperience = 20
-        engineer1.hasCertification = ["Naval Architect", "PE License"]
-        
-        inspector1 = onto.QualityInspector("Inspector_001")
-        inspector1.hasName = "Robert Lee"
-        inspector1.hasID = "QI-001"
-        inspector1.hasExperience = 18
-        inspector1.hasCertification = ["ASNT Level III", "ISO 9001 Lead Auditor"]
-        
-        safety_officer1 = onto.SafetyOfficer("SafetyOfficer_001")
-        safety_officer1.hasName = "Lisa Brown"
-        safety_officer1.hasID = "SO-001"
-        safety_officer1.hasExperience = 12
-        safety_officer1.hasCertification = ["OSHA 30", "CSP"]
-        
-        manager1 = onto.Manager("Manager_001")
-        manager1.hasName = "Michael Anderson"
-        manager1.hasID = "MGR-001"
-        manager1.hasExperience = 25
-        manager1.locatedAt = "office1"
-        
-        # ====================================================================
-        # CREATE PROCESSES
-        # ====================================================================
-        
-        welding_proc1 = onto.WeldingProcess("WeldingProc_H001")
-        welding_proc1.hasName = "Hull Welding - Section A"
-        welding_proc1.hasID = "WP-H001"
-        welding_proc1.hasStatus = "In Progress"
-        welding_proc1.hasCompletionPercentage = 75.0
-        welding_proc1.hasPriority = "High"
-        welding_proc1.hasTemperature = 850.0
-        welding_proc1.operatedBy = welder1
-        welding_proc1.supervisedBy = engineer1
-        welding_proc1.produces = hull1
-        welding_proc1.requires = welding_robot1
-        
-        assembly_proc1 = onto.AssemblyProcess("AssemblyProc_E001")
-        assembly_proc1.hasName = "Engine Installation"
-        assembly_proc1.hasID = "AP-E001"
-        assembly_proc1.hasStatus = "Scheduled"
-        assembly_proc1.hasCompletionPercentage = 0.0
-        assembly_proc1.hasPriority = "Medium"
-        assembly_proc1.supervisedBy = engineer1
-        assembly_proc1.produces = vessel1
-        assembly_proc1.requires = crane1
-        
-        inspection_proc1 = onto.InspectionProcess("InspectionProc_H001")
-        inspection_proc1.hasName = "Hull Quality Inspection"
-        inspection_proc1.hasID = "IP-H001"
-        inspection_proc1.hasStatus = "Completed"
-        inspection_proc1.hasCompletionPercentage = 100.0
-        inspection_proc1.inspectedBy = inspector1
-        
-        painting_proc1 = onto.PaintingProcess("PaintingProc_V001")
-        painting_proc1.hasName = "Hull Surface Coating"
-        painting_proc1.hasID = "PP-V001"
-        painting_proc1.hasStatus = "Pending"
-        painting_proc1.hasCompletionPercentage = 0.0
-        painting_proc1.hasPriority = "Low"
-        painting_proc1.operatedBy = painter1
-        painting_proc1.produces = hull1
-        
-        # ====================================================================
-        # CREATE MATERIALS
-        # ====================================================================
-        
-        steel_plates = onto.SteelPlate("SteelPlate_Stock")
-        steel_plates.hasName = "High-Strength Steel Plates"
-        steel_plates.hasID = "MAT-SP-001"
-        steel_plates.hasQuantity = 500  # units
-        steel_plates.locatedAt = "warehouse1"
-        steel_plates.usedIn = welding_proc1
-        
-        welding_rods = onto.WeldingRod("WeldingRod_Stock")
-        welding_rods.hasName = "E7018 Welding Electrodes"
-        welding_rods.hasID = "MAT-WR-001"
-        welding_rods.hasQuantity = 10000
-        welding_rods.locatedAt = "warehouse1"
-        welding_rods.usedIn = welding_proc1
-        
-        paint_stock = onto.Paint("Paint_Stock")
-        paint_stock.hasName = "Marine Grade Anti-Fouling Paint"
-        paint_stock.hasID = "MAT-PT-001"
-        paint_stock.hasQuantity = 5000  # liters
-        paint_stock.locatedAt = "warehouse1"
-        paint_stock.usedIn = painting_proc1
-        
-        cables = onto.ElectricalCable("Cable_Stock")
-        cables.hasName = "Marine Grade Electrical Cable"
-        cables.hasID = "MAT-EC-001"
-        cables.hasQuantity = 15000  # meters
-        cables.locatedAt = "warehouse1"
-        
-        # ====================================================================
-        # CREATE DIGITAL SYSTEMS
-        # ====================================================================
-        
-        mes_system = onto.MES("MES_System")
-        mes_system.hasName = "Manufacturing Execution System"
-        mes_system.hasID = "DIG-MES-001"
-        mes_system.manages = [welding_proc1, assembly_proc1, painting_proc1]
-        
-        erp_system = onto.ERP("ERP_System")
-        erp_system.hasName = "Enterprise Resource Planning"
-        erp_system.hasID = "DIG-ERP-001"
-        erp_system.manages = [steel_plates, welding_rods, paint_stock, cables]
-        
-        digital_twin1 = onto.DigitalTwin("DigitalTwin_V001")
-        digital_twin1.hasName = "Digital Twin - Pacific Star"
-        digital_twin1.hasID = "DIG-DT-V001"
-        
-        ai_system1 = onto.AISystem("AI_Optimization")
-        ai_system1.hasName = "AI Production Optimizer"
-        ai_system1.hasID = "DIG-AI-001"
-        ai_system1.manages = [welding_proc1, assembly_proc1]
+        for subject, prop, target in SAMPLE_LINKS:
+            value = [objs[t] for t in target] if isinstance(target, list) else objs[target]
+            setattr(objs[subject], prop, value)
+    
+    compute_vessel_aggregates(onto)
     
     print("✓ Sample data populated")
     return onto
 
 
+def _components_by_vessel(components):
+    """Inverted partOf index: vessel -> its components (one pass over the components)."""
+    index = defaultdict(list)
+    for comp in components:
+        for vessel in comp.partOf:
+            index[vessel].append(comp)
+    return index
+
+
+def _sensors_by_host(sensors):
+    """Inverted installedOn index: equipment/asset -> the sensors installed on it."""
+    index = defaultdict(list)
+    for sensor in sensors:
+        host = sensor.installedOn
+        if host is not None:
+            index[host].append(sensor)
+    return index
+
+
+def compute_vessel_aggregates(onto):
+    """Store per-vessel component aggregates as data properties on each Vessel."""
+    
+    comps_by_vessel = _components_by_vessel(onto.VesselComponent.instances())
+    
+    computed_at = datetime.now().isoformat()
+    with onto:
+        for vessel in onto.Vessel.instances():
+            vessel_scores = [c.hasQualityScore for c in comps_by_vessel.get(vessel, ())
+                             if c.hasQualityScore is not None]
+            vessel.hasAggregateQualityScore = sum(vessel_scores) / len(vessel_scores) if vessel_scores else None
+            vessel.hasAggregateComputedAt = computed_at
+
+
 # ============================================================================
 # QUERY AND ANALYSIS FUNCTIONS
 # ============================================================================
 
-def query_vessels(onto):
+def _get(entity, prop, default="N/A"):
+    """Property value, or default when it is unset (None or an empty list)."""
+    value = getattr(entity, prop, None)
+    if value is None or (isinstance(value, list) and not value):
+        return default
+    return value
+
+
+def _name(entity):
+    """Display name of an individual (hasName, falling back to its IRI name)."""
+    return entity.hasName or entity.name
+
+
+def _status_label(entity, default="N/A"):
+    """Display name of an entity's status."""
+    status = entity.hasStatus
+    return status.hasName if status is not None else default
+
+
+def _location_name(entity, default="N/A"):
+    """Display name of the place an entity is locatedIn."""
+    location = entity.locatedIn
+    return _name(location) if location is not None else default
+
+
+def _sparql(onto, query, params=()):
+    """Run a SPARQL query against the ontology's world with its base IRI bound to ``s:``."""
+    prefix = f"PREFIX s: <{onto.base_iri}>\nPREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>\n"
+    return onto.world.sparql(prefix + query, params)
+
+
+def _count_instances(onto, class_name):
+    """Number of individuals of ``class_name`` (including subclasses), counted in the quadstore."""
+    rows = list(_sparql(onto, "SELECT (COUNT(DISTINCT ?x) AS ?n) WHERE { ?x a/rdfs:subClassOf* s:%s }" % class_name))
+    return rows[0][0]
+
+
+def collect_instances(onto):
+    """Materialize every individual once, indexed by each of its classes and their ancestors.
+
+    The report functions below accept this mapping so that ``main`` walks the
+    quadstore a single time instead of once per ``.instances()`` call.
+    """
+    index = defaultdict(list)
+    ancestors = {}
+    for individual in onto.individuals():
+        # Union over the asserted named classes only (is_a may also hold restrictions),
+        # so an individual typed e.g. Welder and Worker is filed under Worker once
+        classes = set()
+        for cls in individual.is_a:
+            if isinstance(cls, ThingClass):
+                if cls not in ancestors:
+                    ancestors[cls] = cls.ancestors()
+                classes |= ancestors[cls]
+        for cls in classes:
+            index[cls].append(individual)
+    return dict(index)
+
+
+@lru_cache(maxsize=None)
+def _worker_types(onto):
+    """Worker classes shown by query_workforce, resolved once per ontology."""
+    return (
+        ("Welders", onto.Welder),
+        ("Electricians", onto.Electrician),
+        ("Painters", onto.Painter),
+        ("Engineers", onto.Engineer),
+        ("Quality Inspectors", onto.QualityInspector),
+        ("Safety Officers", onto.SafetyOfficer),
+        ("Managers", onto.Manager),
+    )
+
+
+@lru_cache(maxsize=None)
+def _sensor_types(onto):
+    """Sensor classes shown by query_iot_sensors, resolved once per ontology."""
+    return (
+        ("Temperature Sensors", onto.TemperatureSensor),
+        ("Vibration Sensors", onto.VibrationSensor),
+        ("Pressure Sensors", onto.PressureSensor),
+        ("Humidity Sensors", onto.HumiditySensor),
+        ("Position Sensors", onto.PositionSensor),
+        ("Safety Sensors", onto.SafetySensor),
+        ("Quality Sensors", onto.QualitySensor),
+    )
+
+
+@lru_cache(maxsize=None)
+def _process_types(onto):
+    """Process classes shown by query_active_processes, resolved once per ontology."""
+    return (
+        ("Welding", onto.WeldingProcess),
+        ("Assembly", onto.AssemblyProcess),
+        ("Inspection", onto.InspectionProcess),
+        ("Painting", onto.PaintingProcess),
+        ("Maintenance", onto.MaintenanceProcess),
+    )
+
+
+@lru_cache(maxsize=None)
+def _equipment_types(onto):
+    """Equipment classes shown by query_equipment_status, resolved once per ontology."""
+    return (
+        ("Cranes", onto.Crane),
+        ("Welding Robots", onto.WeldingRobot),
+        ("Cutting Machines", onto.CuttingMachine),
+        ("Transport Vehicles", onto.TransportVehicle),
+    )
+
+
+@lru_cache(maxsize=None)
+def _system_types(onto):
+    """Digital-system classes shown by query_digital_systems, resolved once per ontology."""
+    return (
+        ("MES (Manufacturing Execution)", onto.MES),
+        ("ERP (Enterprise Resource Planning)", onto.ERP),
+        ("Digital Twins", onto.DigitalTwin),
+        ("AI/ML Systems", onto.AISystem),
+    )
+
+
+def query_vessels(onto, instances=None):
     """Query all vessels and their status."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("VESSEL CONSTRUCTION STATUS")
-    print("="*80)
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("VESSEL CONSTRUCTION STATUS")
+    lines.append(_RULE)
     
-    for vessel in onto.Vessel.instances():
-        print(f"\n🚢 {vessel.hasName if hasattr(vessel, 'hasName') and vessel.hasName is not None else vessel.name}")
-        print(f"   ID: {vessel.hasID if hasattr(vessel, 'hasID') and vessel.hasID is not None else 'N/A'}")
-        print(f"   Type: {vessel.hasVesselType if hasattr(vessel, 'hasVesselType') and vessel.hasVesselType is not None else 'N/A'}")
-        print(f"   Length: {vessel.hasLength if hasattr(vessel, 'hasLength') and vessel.hasLength is not None else 'N/A'} meters")
-        print(f"   Deadweight: {vessel.hasDeadweight if hasattr(vessel, 'hasDeadweight') and vessel.hasDeadweight is not None else 'N/A'} tons")
-        print(f"   Completion: {vessel.hasCompletionPercentage if hasattr(vessel, 'hasCompletionPercentage') and vessel.hasCompletionPercentage is not None else 'N/A'}%")
-        print(f"   Status: {vessel.hasStatus if hasattr(vessel, 'hasStatus') and vessel.hasStatus is not None else 'N/A'}")
+    comps_by_vessel = _components_by_vessel(instances.get(onto.VesselComponent, ()))
+    
+    for vessel in instances.get(onto.Vessel, ()):
+        lines.append(f"\n🚢 {_name(vessel)}")
+        lines.append(f"   ID: {_get(vessel, 'hasID')}")
+        lines.append(f"   Type: {_get(vessel, 'hasVesselType')}")
+        lines.append(f"   Length: {_get(vessel, 'hasLength')} meters")
+        lines.append(f"   Deadweight: {_get(vessel, 'hasDeadweight')} tons")
+        lines.append(f"   Completion: {_get(vessel, 'hasCompletionPercentage')}%")
+        lines.append(f"   Status: {_status_label(vessel)}")
+        if vessel.hasAggregateQualityScore is not None:
+            lines.append(f"   Average Component Quality: {vessel.hasAggregateQualityScore:.1f}")
         
         if vessel.locatedIn:
             location = vessel.locatedIn
-            print(f"   Location: {location.hasName if hasattr(location, 'hasName') and location.hasName is not None else location.name}")
+            lines.append(f"   Location: {_name(location)}")
         
         # Show components
-        components = [c for c in onto.VesselComponent.instances() if vessel in c.partOf]
+        components = comps_by_vessel.get(vessel, ())
         if components:
-            print(f"   Components: {len(components)}")
+            lines.append(f"   Components: {len(components)}")
             for comp in components:
-                comp_name = comp.hasName if hasattr(comp, 'hasName') and comp.hasName is not None else comp.name
-                quality = comp.hasQualityScore   if hasattr(comp, 'hasQualityScore') and comp.hasQualityScore is not None else 'N/A'
-                print(f"      • {comp_name} (Quality: {quality})")
+                comp_name = _name(comp)
+                quality = _get(comp, 'hasQualityScore')
+                lines.append(f"      • {comp_name} (Quality: {quality})")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def query_workforce(onto):
+def query_workforce(onto, instances=None):
     """Query workforce distribution."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("WORKFORCE OVERVIEW")
-    print("="*80)
-    
-    worker_types = {
-        "Welders": onto.Welder,
-        "Electricians": onto.Electrician,
-        "Painters": onto.Painter,
-        "Engineers": onto.Engineer,
-        "Quality Inspectors": onto.QualityInspector,
-        "Safety Officers": onto.SafetyOfficer,
-        "Managers": onto.Manager
-    }
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("WORKFORCE OVERVIEW")
+    lines.append(_RULE)
     
-    for role, worker_class in worker_types.items():
-        workers = list(worker_class.instances())
-        print(f"\n{role}: {len(workers)}")
+    for role, worker_class in _worker_types(onto):
+        workers = instances.get(worker_class, [])
+        lines.append(f"\n{role}: {len(workers)}")
         for worker in workers:
-            name = worker.hasName if hasattr(worker, 'hasName') and worker.hasName is not None else worker.name
-            exp = worker.hasExperience if hasattr(worker, 'hasExperience') and worker.hasExperience is not None else 'N/A'
-            certs = ", ".join(worker.hasCertification) if hasattr(worker, 'hasCertification') and worker.hasCertification is not None else 'None'
-            location = worker.locatedIn.hasName if hasattr(worker, 'locatedIn') and worker.locatedIn is not None and hasattr(worker.locatedIn, 'hasName') and worker.locatedIn.hasName is not None else 'N/A'
-            print(f"   • {name} (Exp: {exp} years, Location: {location})")
-            if certs != 'None':
-                print(f"     Certifications: {certs}")
+            name = _name(worker)
+            exp = _get(worker, 'hasExperience')
+            certs = _get(worker, 'hasCertification', None)
+            location = _location_name(worker)
+            lines.append(f"   • {name} (Exp: {exp} years, Location: {location})")
+            if certs:
+                lines.append(f"     Certifications: {', '.join(certs)}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def query_iot_sensors(onto):
+def query_iot_sensors(onto, instances=None):
     """Query IoT sensor deployment."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("IoT SENSOR NETWORK")
-    print("="*80)
-    
-    sensor_types = {
-        "Temperature Sensors": onto.TemperatureSensor,
-        "Vibration Sensors": onto.VibrationSensor,
-        "Pressure Sensors": onto.PressureSensor,
-        "Humidity Sensors": onto.HumiditySensor,
-        "Position Sensors": onto.PositionSensor,
-        "Safety Sensors": onto.SafetySensor,
-        "Quality Sensors": onto.QualitySensor
-    }
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("IoT SENSOR NETWORK")
+    lines.append(_RULE)
     
     total_sensors = 0
-    for sensor_type, sensor_class in sensor_types.items():
-        sensors = list(sensor_class.instances())
+    for sensor_type, sensor_class in _sensor_types(onto):
+        sensors = instances.get(sensor_class, [])
         total_sensors += len(sensors)
         if sensors:
-            print(f"\n{sensor_type}: {len(sensors)}")
+            lines.append(f"\n{sensor_type}: {len(sensors)}")
             for sensor in sensors:
-                name = sensor.hasName[0] if sensor.hasName else sensor.name
-                sensor_id = sensor.hasID[0] if sensor.hasID else 'N/A'
+                name = _name(sensor)
+                sensor_id = _get(sensor, 'hasID')
                 
                 # Get monitoring target
                 target = "N/A"
                 if sensor.monitors:
                     target_obj = sensor.monitors
-                    target = target_obj.hasName if hasattr(target_obj, 'hasName') and target_obj.hasName is not None else target_obj.name
+                    target = _name(target_obj)
                 
-                print(f"   • {name} (ID: {sensor_id})")
-                print(f"     Monitoring: {target}")
+                lines.append(f"   • {name} (ID: {sensor_id})")
+                lines.append(f"     Monitoring: {target}")
                 
                 # Show sensor readings
-                if hasattr(sensor, 'hasTemperature') and sensor.hasTemperature:
-                    print(f"     Reading: {sensor.hasTemperature}°C")
-                elif hasattr(sensor, 'hasVibration') and sensor.hasVibration:
-                    print(f"     Reading: {sensor.hasVibration} mm/s")
-                elif hasattr(sensor, 'hasCoordinates') and sensor.hasCoordinates:
-                    print(f"     Coordinates: {sensor.hasCoordinates}")
+                if sensor.hasTemperature:
+                    lines.append(f"     Reading: {sensor.hasTemperature}°C")
+                elif sensor.hasVibration:
+                    lines.append(f"     Reading: {sensor.hasVibration} mm/s")
+                elif sensor.hasCoordinates:
+                    lines.append(f"     Coordinates: {sensor.hasCoordinates}")
     
-    print(f"\n📊 Total Sensors Deployed: {total_sensors}")
+    lines.append(f"\n📊 Total Sensors Deployed: {total_sensors}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def query_active_processes(onto):
+def query_active_processes(onto, instances=None):
     """Query active manufacturing processes."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("ACTIVE MANUFACTURING PROCESSES")
-    print("="*80)
-    
-    process_types = {
-        "Welding": onto.WeldingProcess,
-        "Assembly": onto.AssemblyProcess,
-        "Inspection": onto.InspectionProcess,
-        "Painting": onto.PaintingProcess,
-        "Maintenance": onto.MaintenanceProcess
-    }
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("ACTIVE MANUFACTURING PROCESSES")
+    lines.append(_RULE)
     
-    for proc_type, proc_class in process_types.items():
-        processes = list(proc_class.instances())
+    for proc_type, proc_class in _process_types(onto):
+        processes = instances.get(proc_class, [])
         if processes:
-            print(f"\n{proc_type} Processes: {len(processes)}")
+            lines.append(f"\n{proc_type} Processes: {len(processes)}")
             for proc in processes:
-                name = proc.hasName if hasattr(proc, 'hasName') and proc.hasName is not None else proc.name
-                status = proc.hasStatus if hasattr(proc, 'hasStatus') and proc.hasStatus is not None else 'N/A'
-                completion = proc.hasCompletionPercentage  if hasattr(proc, 'hasCompletionPercentage') and proc.hasCompletionPercentage is not None else 0
-                priority = proc.hasPriority if hasattr(proc, 'hasPriority') and proc.hasPriority is not None else 'N/A'
+                name = _name(proc)
+                status = _status_label(proc)
+                completion = _get(proc, 'hasCompletionPercentage', 0)
+                priority = _get(proc, 'hasPriority')
                 
-                print(f"\n   📋 {name}")
-                print(f"      Status: {status}")
-                print(f"      Completion: {completion}%")
-                print(f"      Priority: {priority}")
+                lines.append(f"\n   📋 {name}")
+                lines.append(f"      Status: {status}")
+                lines.append(f"      Completion: {completion}%")
+                lines.append(f"      Priority: {priority}")
                 
                 # Show operator
                 if proc.operatedBy:
-                    operator = proc.operatedBy if hasattr(proc, 'operatedBy') else None
-                    op_name = operator.hasName if hasattr(operator, 'hasName') and operator.hasName is not None else operator.name
-                    print(f"      Operator: {op_name}")
+                    operator = proc.operatedBy
+                    op_name = _name(operator)
+                    lines.append(f"      Operator: {op_name}")
                 
                 # Show supervisor
                 if proc.supervisedBy:
-                    supervisor = proc.supervisedBy if hasattr(proc, 'supervisedBy') else None
-                    sup_name = supervisor.hasName if hasattr(supervisor, 'hasName') and supervisor.hasName is not None else supervisor.name
-                    print(f"      Supervisor: {sup_name}")
+                    supervisor = proc.supervisedBy
+                    sup_name = _name(supervisor)
+                    lines.append(f"      Supervisor: {sup_name}")
                 
                 # Show required equipment
                 if proc.requires:
-                    equipment = proc.requires if hasattr(proc, 'requires') else None
-                    eq_name = equipment.hasName if hasattr(equipment, 'hasName') and equipment.hasName is not None else equipment.name
-                    print(f"      Equipment: {eq_name}")
+                    equipment = proc.requires
+                    eq_name = _name(equipment)
+                    lines.append(f"      Equipment: {eq_name}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def query_inventory(onto):
+def query_inventory(onto, instances=None):
     """Query material inventory."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("MATERIAL INVENTORY")
-    print("="*80)
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("MATERIAL INVENTORY")
+    lines.append(_RULE)
     
-    materials = list(onto.Material.instances())
+    materials = instances.get(onto.Material, [])
     
     for material in materials:
-        name = material.hasName if hasattr(material, 'hasName') and material.hasName is not None else material.name
-        mat_id = material.hasID if hasattr(material, 'hasID') and material.hasID is not None else 'N/A'
-        quantity = material.hasQuantity if hasattr(material, 'hasQuantity') and material.hasQuantity is not None else 0
+        name = _name(material)
+        mat_id = _get(material, 'hasID')
+        quantity = _get(material, 'hasQuantity', 0)
         
-        location = "N/A"
-        if material.locatedIn:
-            loc_obj = material.locatedIn
-            location = loc_obj.hasName if hasattr(loc_obj, 'hasName') and loc_obj.hasName is not None else loc_obj.name
+        location = _location_name(material)
         
-        print(f"\n📦 {name}")
-        print(f"   ID: {mat_id}")
-        print(f"   Quantity: {quantity}")
-        print(f"   Location: {location}")
+        lines.append(f"\n📦 {name}")
+        lines.append(f"   ID: {mat_id}")
+        lines.append(f"   Quantity: {quantity}")
+        lines.append(f"   Location: {location}")
         
         # Show where used
         if material.usedIn:
             proc = material.usedIn
-            print(f"   Used in processes:")
-            proc_name = proc.hasName if hasattr(proc, 'hasName') and proc.hasName is not None else proc.name
-            print(f"      • {proc_name}")
+            lines.append(f"   Used in processes:")
+            proc_name = _name(proc)
+            lines.append(f"      • {proc_name}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def query_equipment_status(onto):
+def query_equipment_status(onto, instances=None):
     """Query equipment operational status."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("EQUIPMENT STATUS")
-    print("="*80)
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("EQUIPMENT STATUS")
+    lines.append(_RULE)
     
-    equipment_types = {
-        "Cranes": onto.Crane,
-        "Welding Robots": onto.WeldingRobot,
-        "Cutting Machines": onto.CuttingMachine,
-        "Transport Vehicles": onto.TransportVehicle
-    }
+    sensors_by_host = _sensors_by_host(instances.get(onto.Sensor, ()))
     
-    for eq_type, eq_class in equipment_types.items():
-        equipment_list = list(eq_class.instances())
+    for eq_type, eq_class in _equipment_types(onto):
+        equipment_list = instances.get(eq_class, [])
         if equipment_list:
-            print(f"\n{eq_type}: {len(equipment_list)}")
+            lines.append(f"\n{eq_type}: {len(equipment_list)}")
             for eq in equipment_list:
-                name = eq.hasName[0] if eq.hasName else eq.name
-                eq_id = eq.hasID if hasattr(eq, 'hasID') and eq.hasID is not None else 'N/A'
-                status = eq.hasStatus if hasattr(eq, 'hasStatus') and eq.hasStatus is not None else 'Unknown'
-                capacity = eq.hasCapacity if hasattr(eq, 'hasCapacity') and eq.hasCapacity is not None else 'N/A'
+                name = _name(eq)
+                eq_id = _get(eq, 'hasID')
+                status = _status_label(eq, 'Unknown')
+                capacity = _get(eq, 'hasCapacity')
                 
-                location = "N/A"
-                if eq.locatedIn:
-                    loc_obj = eq.locatedIn
-                    location = loc_obj.hasName if hasattr(loc_obj, 'hasName') and loc_obj.hasName is not None else loc_obj.name
+                location = _location_name(eq)
                 
-                print(f"\n   ⚙️  {name}")
-                print(f"      ID: {eq_id}")
-                print(f"      Status: {status}")
-                print(f"      Capacity: {capacity}")
-                print(f"      Location: {location}")
+                lines.append(f"\n   ⚙️  {name}")
+                lines.append(f"      ID: {eq_id}")
+                lines.append(f"      Status: {status}")
+                lines.append(f"      Capacity: {capacity}")
+                lines.append(f"      Location: {location}")
                 
                 # Show attached sensors
-                sensors = [s for s in onto.Sensor.instances() if hasattr(s, 'installedOn') and s.installedOn == eq]
+                sensors = sensors_by_host.get(eq, ())
                 if sensors:
-                    print(f"      Sensors: {len(sensors)}") 
+                    lines.append(f"      Sensors: {len(sensors)}") 
                     for sensor in sensors:
-                        sensor_name = sensor.hasName if hasattr(sensor, 'hasName') and sensor.hasName is not None   else sensor.name
-                        print(f"         • {sensor_name}")
+                        sensor_name = _name(sensor)
+                        lines.append(f"         • {sensor_name}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def query_digital_systems(onto):
+def query_digital_systems(onto, instances=None):
     """Query digital infrastructure."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
-    print("DIGITAL SYSTEMS & SMART TECHNOLOGIES")
-    print("="*80)
+    lines = []
+    lines.append(_HEADER_RULE)
+    lines.append("DIGITAL SYSTEMS & SMART TECHNOLOGIES")
+    lines.append(_RULE)
     
-    system_types = {
-        "MES (Manufacturing Execution)": onto.MES,
-        "ERP (Enterprise Resource Planning)": onto.ERP,
-        "Digital Twins": onto.DigitalTwin,
-        "AI/ML Systems": onto.AISystem
-    }
-    
-    for sys_type, sys_class in system_types.items():
-        systems = list(sys_class.instances())
+    for sys_type, sys_class in _system_types(onto):
+        systems = instances.get(sys_class, [])
         if systems:
-            print(f"\n{sys_type}: {len(systems)}")
+            lines.append(f"\n{sys_type}: {len(systems)}")
             for system in systems:
-                name = system.hasName[0] if system.hasName else system.name
-                sys_id = system.hasID[0] if system.hasID else 'N/A'
+                name = _name(system)
+                sys_id = _get(system, 'hasID')
                 
-                print(f"\n   💻 {name}")
-                print(f"      ID: {sys_id}")
+                lines.append(f"\n   💻 {name}")
+                lines.append(f"      ID: {sys_id}")
                 
                 # Show what it manages
-                if system.manages:
-                    print(f"      Managing {len(system.manages)} entities:")
-                    for managed in system.manages[:5]:  # Show first 5
-                        managed_name = managed.hasName[0] if managed.hasName else managed.name
-                        print(f"         • {managed_name}")
-                    if len(system.manages) > 5:
-                        print(f"         ... and {len(system.manages) - 5} more")
+                managed_entities = system.manages
+                total_managed = len(managed_entities)
+                if total_managed:
+                    lines.append(f"      Managing {total_managed} entities:")
+                    for managed in islice(managed_entities, 5):  # Show first 5
+                        managed_name = _name(managed)
+                        lines.append(f"         • {managed_name}")
+                    if total_managed > 5:
+                        lines.append(f"         ... and {total_managed - 5} more")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def generate_shipyard_analytics(onto):
+def generate_shipyard_analytics(onto, instances=None):
     """Generate analytics and KPIs."""
+    if instances is None:
+        instances = collect_instances(onto)
     
-    print("\n" + "="*80)
+    print(_HEADER_RULE)
     print("SHIPYARD ANALYTICS & KPIs")
-    print("="*80)
+    print(_RULE)
     
-    # Count entities
-    total_vessels = len(list(onto.Vessel.instances()))
-    total_workers = len(list(onto.Worker.instances()))
-    total_equipment = len(list(onto.Equipment.instances()))
-    total_sensors = len(list(onto.Sensor.instances()))
-    total_processes = len(list(onto.Process.instances()))
+    vessels = instances.get(onto.Vessel, [])
+    equipment = instances.get(onto.Equipment, [])
+    processes = instances.get(onto.Process, [])
+    total_workers = len(instances.get(onto.Worker, ()))
+    total_sensors = len(instances.get(onto.Sensor, ()))
     
     print(f"\n📊 Key Metrics:")
-    print(f"   Vessels under construction: {total_vessels}")
+    print(f"   Vessels under construction: {len(vessels)}")
     print(f"   Total workforce: {total_workers}")
-    print(f"   Equipment units: {total_equipment}")
+    print(f"   Equipment units: {len(equipment)}")
     print(f"   IoT sensors deployed: {total_sensors}")
-    print(f"   Active processes: {total_processes}")
+    print(f"   Active processes: {len(processes)}")
     
     # Calculate average completion
-    vessels = list(onto.Vessel.instances())
     if vessels:
-        avg_completion = sum(v.hasCompletionPercentage if hasattr(v, 'hasCompletionPercentage') and v.hasCompletionPercentage is not None else 0 for v in vessels) / len(vessels)
-        print(f"   Average vessel completion: {avg_completion:.1f}%")
+        total_completion = sum(_get(v, 'hasCompletionPercentage', 0) for v in vessels)
+        print(f"   Average vessel completion: {total_completion / len(vessels):.1f}%")
     
     # Process status breakdown
-    processes = list(onto.Process.instances())
-    status_count = {}
-    for proc in processes:
-        status = proc.hasStatus[0] if proc.hasStatus else 'Unknown'
-        status_count[status] = status_count.get(status, 0) + 1
+    status_count = Counter(_status_label(proc, 'Unknown') for proc in processes)
     
     print(f"\n📈 Process Status Distribution:")
-    for status, count in status_count.items():
+    for status, count in status_count.most_common():
         print(f"   {status}: {count}")
     
     # Equipment utilization
-    equipment = list(onto.Equipment.instances())
-    operational = sum(1 for eq in equipment if eq.hasStatus and eq.hasStatus[0] == 'Operational')
+    operational_status = onto.Operational
+    operational = sum(1 for eq in equipment if eq.hasStatus == operational_status)
     utilization = (operational / len(equipment) * 100) if equipment else 0
     
     print(f"\n⚙️  Equipment Utilization:")
     print(f"   Operational: {operational}/{len(equipment)} ({utilization:.1f}%)")
     
     # Quality metrics
-    components = list(onto.VesselComponent.instances())
-    components_with_quality = [c for c in components if c.hasQualityScore]
-    if components_with_quality:
-        avg_quality = sum(c.hasQualityScore if hasattr(c, 'hasQualityScore') and c.hasQualityScore is not None else 0 for c in components_with_quality) / len(components_with_quality)
+    scores = [c.hasQualityScore for c in instances.get(onto.VesselComponent, ()) if c.hasQualityScore]
+    if scores:
         print(f"\n✅ Quality Metrics:")
-        print(f"   Average component quality score: {avg_quality:.1f}/100")
+        print(f"   Average component quality score: {sum(scores) / len(scores):.1f}/100")
 
 
 def build_shipyard_snapshot() -> dict[str, Any]:
@@ -1060,11 +1224,11 @@ def build_shipyard_snapshot() -> dict[str, Any]:
     for vessel in onto.Vessel.instances():
         vessels.append(
             {
-                "name": vessel.hasName if hasattr(vessel, "hasName") and vessel.hasName is not None else vessel.name,
-                "id": vessel.hasID if hasattr(vessel, "hasID") and vessel.hasID is not None else None,
-                "type": vessel.hasVesselType if hasattr(vessel, "hasVesselType") and vessel.hasVesselType is not None else None,
-                "completion_percentage": float(vessel.hasCompletionPercentage if hasattr(vessel, "hasCompletionPercentage") and vessel.hasCompletionPercentage is not None else 0),
-                "status": vessel.hasStatus if hasattr(vessel, "hasStatus") and vessel.hasStatus is not None else "Unknown",
+                "name": _name(vessel),
+                "id": _get(vessel, "hasID", None),
+                "type": _get(vessel, "hasVesselType", None),
+                "completion_percentage": float(_get(vessel, "hasCompletionPercentage", 0)),
+                "status": _status_label(vessel, "Unknown"),
             }
         )
 
@@ -1072,38 +1236,34 @@ def build_shipyard_snapshot() -> dict[str, Any]:
     for material in onto.Material.instances():
         materials.append(
             {
-                "name": material.hasName if hasattr(material, "hasName") and material.hasName is not None else material.name,
-                "id": material.hasID if hasattr(material, "hasID") and material.hasID is not None else None,
-                "quantity": int(material.hasQuantity if hasattr(material, "hasQuantity") and material.hasQuantity is not None else 0),
+                "name": _name(material),
+                "id": _get(material, "hasID", None),
+                "quantity": int(_get(material, "hasQuantity", 0)),
             }
         )
 
     high_priority_processes = []
     for process in onto.Process.instances():
-        priority = process.hasPriority if hasattr(process, "hasPriority") and process.hasPriority is not None else None
+        priority = _get(process, "hasPriority", None)
         if priority == "High":
             supervisor = None
             if process.supervisedBy:
                 supervisor_obj = process.supervisedBy
-                supervisor = supervisor_obj.hasName if hasattr(supervisor_obj, "hasName") and supervisor_obj.hasName is not None else supervisor_obj.name
+                supervisor = _name(supervisor_obj)
             high_priority_processes.append(
                 {
-                    "name": process.hasName if hasattr(process, "hasName") and process.hasName is not None else process.name,
-                    "status": process.hasStatus if hasattr(process, "hasStatus") and process.hasStatus is not None else "Unknown",
+                    "name": _name(process),
+                    "status": _status_label(process, "Unknown"),
                     "supervisor": supervisor or "Unassigned",
                 }
             )
 
     all_vessels = list(onto.Vessel.instances())
-    all_equipment = list(onto.Equipment.instances())
-    all_sensors = list(onto.Sensor.instances())
-    all_workers = list(onto.Worker.instances())
-    all_processes = list(onto.Process.instances())
 
     average_completion = 0.0
     if all_vessels:
         average_completion = sum(
-            float(vessel.hasCompletionPercentage if hasattr(vessel, "hasCompletionPercentage") and vessel.hasCompletionPercentage is not None else 0)
+            float(_get(vessel, "hasCompletionPercentage", 0))
             for vessel in all_vessels
         ) / len(all_vessels)
 
@@ -1113,24 +1273,30 @@ def build_shipyard_snapshot() -> dict[str, Any]:
         "high_priority_processes": high_priority_processes,
         "analytics": {
             "total_vessels": len(all_vessels),
-            "total_workers": len(all_workers),
-            "total_equipment": len(all_equipment),
-            "total_sensors": len(all_sensors),
-            "total_processes": len(all_processes),
+            "total_workers": _count_instances(onto, "Worker"),
+            "total_equipment": _count_instances(onto, "Equipment"),
+            "total_sensors": _count_instances(onto, "Sensor"),
+            "total_processes": _count_instances(onto, "Process"),
             "average_completion_percentage": average_completion,
         },
     }
 
 
-def save_ontology(onto):
-    """Save the ontology to file."""
+def save_ontology(onto, filename="smart_shipyard.owl", format="rdfxml"):
+    """Save the ontology to file.
+
+    RDF/XML is the default because Protégé, WebVOWL and testwithllm.py read the
+    .owl file; pass ``format="ntriples"`` for a faster dump meant only for
+    reloading with owlready2.
+    """
     
-    print("\n" + "="*80)
+    print(_HEADER_RULE)
     print("SAVING ONTOLOGY")
-    print("="*80)
+    print(_RULE)
     
-    onto.save(file="smart_shipyard.owl", format="rdfxml")
-    print("✓ Ontology saved to 'smart_shipyard.owl'")
+    with open(filename, "wb") as f:
+        onto.save(file=f, format=format)
+    print(f"✓ Ontology saved to '{filename}'")
     print("\nYou can open this file with:")
     print("  • Protégé: https://protege.stanford.edu/")
     print("  • WebVOWL: http://vowl.visualdataweb.org/webvowl.html")
@@ -1144,36 +1310,43 @@ def find_vessels_by_completion(onto, min_completion=50):
     """Find vessels with completion above threshold."""
     
     print(f"\n🔍 Vessels with >{min_completion}% completion:")
-    for vessel in onto.Vessel.instances():
-        if vessel.hasCompletionPercentage and vessel.hasCompletionPercentage > min_completion:
-            name = vessel.hasName if hasattr(vessel, 'hasName') and vessel.hasName is not None else vessel.name
-            completion = vessel.hasCompletionPercentage
-            print(f"   • {name}: {completion}%")
+    # Listed most complete first (not in .instances() order)
+    rows = _sparql(onto, """
+        SELECT DISTINCT ?v ?c WHERE {
+            ?v a/rdfs:subClassOf* s:Vessel ; s:hasCompletionPercentage ?c .
+            FILTER(?c > ??1)
+        } ORDER BY DESC(?c)""", [min_completion])
+    for vessel, completion in rows:
+        print(f"   • {_name(vessel)}: {completion}%")
 
 
 def find_experienced_workers(onto, min_years=10):
     """Find workers with experience above threshold."""
     
     print(f"\n🔍 Workers with >{min_years} years experience:")
-    for worker in onto.Worker.instances():
-        if worker.hasExperience and worker.hasExperience > min_years:
-            name = worker.hasName if hasattr(worker, 'hasName') and worker.hasName is not None else worker.name
-            exp = worker.hasExperience
-            worker_type = type(worker).__name__
-            print(f"   • {name} ({worker_type}): {exp} years")
+    # Listed most experienced first (not in .instances() order)
+    rows = _sparql(onto, """
+        SELECT DISTINCT ?w ?e WHERE {
+            ?w a/rdfs:subClassOf* s:Worker ; s:hasExperience ?e .
+            FILTER(?e > ??1)
+        } ORDER BY DESC(?e)""", [min_years])
+    for worker, exp in rows:
+        worker_type = type(worker).__name__
+        print(f"   • {_name(worker)} ({worker_type}): {exp} years")
 
 
 def find_high_priority_processes(onto):
     """Find high priority processes."""
     
     print(f"\n🔍 High Priority Processes:")
-    for process in onto.Process.instances():
-        if process.hasPriority and process.hasPriority[0] == "High":
-            name = process.hasName[0] if process.hasName else process.name
-            status = process.hasStatus[0] if process.hasStatus else 'N/A'
-            completion = process.hasCompletionPercentage[0] if process.hasCompletionPercentage else 0
-            print(f"   • {name}")
-            print(f"     Status: {status}, Completion: {completion}%")
+    rows = _sparql(onto, """
+        SELECT DISTINCT ?p ?c WHERE {
+            ?p a/rdfs:subClassOf* s:Process ; s:hasPriority "High" .
+            OPTIONAL { ?p s:hasCompletionPercentage ?c }
+        }""")
+    for process, completion in rows:
+        print(f"   • {_name(process)}")
+        print(f"     Status: {_status_label(process)}, Completion: {completion if completion is not None else 0}%")
 
 
 # ============================================================================
@@ -1183,41 +1356,52 @@ def find_high_priority_processes(onto):
 def main():
     """Main execution function."""
     
-    print("\n" + "="*80)
+    print(_HEADER_RULE)
     print("SMART SHIPYARD ONTOLOGY SYSTEM")
     print("Comprehensive Digital Twin for Shipyard 4.0")
-    print("="*80)
+    print(_RULE)
     
     # Create and populate ontology
     onto = create_smart_shipyard_ontology()
     onto = populate_shipyard_data(onto)
     
+    # The ontology is not modified by the reports, so list its individuals once
+    instances = collect_instances(onto)
+    
     # Execute queries
-    query_vessels(onto)
-    query_workforce(onto)
-    query_iot_sensors(onto)
-    query_active_processes(onto)
-    query_equipment_status(onto)
-    query_inventory(onto)
-    query_digital_systems(onto)
+    query_vessels(onto, instances)
+    query_workforce(onto, instances)
+    query_iot_sensors(onto, instances)
+    query_active_processes(onto, instances)
+    query_equipment_status(onto, instances)
+    query_inventory(onto, instances)
+    query_digital_systems(onto, instances)
     
     # Analytics
-    generate_shipyard_analytics(onto)
+    generate_shipyard_analytics(onto, instances)
     
     # Advanced queries
-    print("\n" + "="*80)
+    print(_HEADER_RULE)
     print("ADVANCED QUERIES")
-    print("="*80)
+    print(_RULE)
     find_vessels_by_completion(onto, min_completion=50)
     find_experienced_workers(onto, min_years=10)
     find_high_priority_processes(onto)
     
+    # LLM prompt built from the live ontology (no save/re-parse of the .owl file)
+    if os.environ.get('SHIPYARD_LLM_SUMMARY'):
+        from testwithllm import build_prompt
+        print(_HEADER_RULE)
+        print("LLM ONTOLOGY PROMPT")
+        print(_RULE)
+        print(build_prompt(onto))
+    
     # Save ontology
     save_ontology(onto)
     
-    print("\n" + "="*80)
+    print(_HEADER_RULE)
     print("SMART SHIPYARD ONTOLOGY SYSTEM - COMPLETED")
-    print("="*80)
+    print(_RULE)
     print("\nKey Features Demonstrated:")
     print("  ✓ Vessel construction management")
     print("  ✓ IoT sensor network integration")
@@ -1229,7 +1413,7 @@ def main():
     print("  ✓ Quality control and inspection")
     print("  ✓ Safety monitoring")
     print("  ✓ Analytics and KPIs")
-    print("="*80 + "\n")
+    print(_RULE + "\n")
 
 
 if __name__ == "__main__":
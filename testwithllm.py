@@ -1,23 +1,36 @@
 from owlready2 import get_ontology
 
-# Load ontology
-onto = get_ontology("smart_shipyard.owl").load()
 
-# Extract relevant information (classes, properties, etc.)
-classes = list(onto.classes())
-relations = list(onto.object_properties())
+def summarize_for_llm(onto):
+    """Textual summary of an ontology (classes, properties, etc.) for the LLM.
 
-# Prepare a textual summary for the LLM
-summary = f"Classes: {[cls.name for cls in classes]}\n"
-summary += f"Relations: {[rel.name for rel in relations]}\n"
-# Add more details as needed
-print (summary)
+    Takes a live ontology, so a pipeline that already holds the populated
+    ``onto`` can pass it in instead of re-parsing smart_shipyard.owl.
+    """
+    # Add more details as needed
+    return (
+        f"Classes: [{', '.join(repr(cls.name) for cls in onto.classes())}]\n"
+        f"Relations: [{', '.join(repr(rel.name) for rel in onto.object_properties())}]\n"
+    )
 
-# Example prompt for LLM
-prompt = f"Given this ontology:\n{summary}\nWhat are the main risks in this system?"
 
-# Send prompt to LLM (e.g., via OpenAI API) and get response
-# response = openai.ChatCompletion.create(...)
+def build_prompt(onto):
+    """Example prompt for the LLM."""
+    summary = summarize_for_llm(onto)
+    return f"Given this ontology:\n{summary}\nWhat are the main risks in this system?"
 
-# Print or process the response
-# print(response['choices'][0]['message']['content'])
\ No newline at end of file
+
+if __name__ == "__main__":
+    # Load ontology
+    onto = get_ontology("smart_shipyard.owl").load()
+
+    summary = summarize_for_llm(onto)
+    print (summary)
+
+    prompt = build_prompt(onto)
+
+    # Send prompt to LLM (e.g., via OpenAI API) and get response
+    # response = openai.ChatCompletion.create(...)
+
+    # Print or process the response
+    # print(response['choices'][0]['message']['content'])